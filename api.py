@@ -1,14 +1,16 @@
 # backend/api.py
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Request, BackgroundTasks
+from fastapi import FastAPI, HTTPException, WebSocket, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional, Union
-import json
+import orjson
 import asyncio
 import time
 import logging
-import math
+import numpy as np
 
 # --- CORE IMPORTS ---
 from backend import config # Your main configuration file
@@ -73,12 +75,21 @@ class BlackScholesRequest(BaseModel):
     risk_free_rate: Optional[float] = None
     volatility: Optional[float] = None
 
+class BlackScholesBatchRequest(BaseModel):
+    current_price: float
+    strike_prices: List[float]
+    time_to_expiry_years: float
+    option_type: str = Field(..., pattern="^(call|put)$")
+    risk_free_rate: Optional[float] = None
+    volatility: Optional[float] = None
+
 # --- FastAPI Application Setup ---
 app = FastAPI(
     title=f"{config.PLATFORM_NAME} API",
     version=config.VERSION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse # Rust-backed serialization for large chain payloads
 )
 
 app.add_middleware(
@@ -89,69 +100,144 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+_SLOW_REQUEST_THRESHOLD_NS = 100_000_000 # 100ms
+
 @app.middleware("http")
 async def log_requests_middleware(request: Request, call_next):
-    start_time = time.perf_counter()
+    start_ns = time.perf_counter_ns()
     response = await call_next(request)
-    process_time = time.perf_counter() - start_time
-    if process_time > 0.1: # Log only if request is slower than 100ms
-        logger.warning(f"⚠️ Slow request: {request.method} {request.url.path} took {process_time:.3f}s")
+    elapsed_ns = time.perf_counter_ns() - start_ns
+    if elapsed_ns > _SLOW_REQUEST_THRESHOLD_NS:
+        # %-style args: the fast path never builds the message string.
+        logger.warning("⚠️ Slow request: %s %s took %.3fs", request.method, request.url.path, elapsed_ns / 1e9)
     return response
 
 # +++ ADDED: asyncio.Event for startup synchronization +++
 api_startup_complete_event = asyncio.Event()
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+# Frame types that may be shed when a slow client's send queue fills up.
+# Trade/position lifecycle frames are never dropped.
+_DROPPABLE_MESSAGE_TYPES = frozenset({"price_update", "market_update", "keepalive", "position_update"})
+
 # --- WebSocket Manager ---
 class SimpleWebSocketManager:
+    # All state lives on one event loop; plain dict/list mutations between await
+    # points are atomic there, so no asyncio.Lock (each `async with lock` would
+    # cost two coroutine creations plus scheduler hops per broadcast).
+    SEND_QUEUE_MAXSIZE = 256
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: set[WebSocket] = set() # O(1) add/discard; ordering is never used
         self.user_connections: Dict[str, WebSocket] = {}
-        self._lock = asyncio.Lock() # For thread-safe modifications if needed, though FastAPI runs in single event loop
+        self.ws_to_uid: Dict[int, str] = {} # id(websocket) -> user_id reverse map for O(1) cleanup
+        # Per-connection send queue + writer task: writes to one socket stay
+        # ordered, while the broadcaster never awaits a slow consumer.
+        self.send_queues: Dict[int, asyncio.Queue] = {}
+        self.writer_tasks: Dict[int, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _assert_single_loop(self):
+        running_loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = running_loop
+        elif running_loop is not self._loop:
+            raise RuntimeError("SimpleWebSocketManager used from multiple event loops")
 
     async def connect(self, websocket: WebSocket, user_id: Optional[str] = None):
+        self._assert_single_loop()
         await websocket.accept()
-        async with self._lock:
-            self.active_connections.append(websocket)
-            if user_id: self.user_connections[user_id] = websocket
-        logger.info(f"🔌 WebSocket connected (Total: {len(self.active_connections)}, Users: {len(self.user_connections)})")
+        # Mutations happen together after the await, with no yield in between.
+        self.active_connections.add(websocket)
+        if user_id:
+            self.user_connections[user_id] = websocket
+            self.ws_to_uid[id(websocket)] = user_id
+        send_queue: asyncio.Queue = asyncio.Queue(maxsize=self.SEND_QUEUE_MAXSIZE)
+        self.send_queues[id(websocket)] = send_queue
+        self.writer_tasks[id(websocket)] = asyncio.create_task(self._drain_send_queue(websocket, send_queue))
+        logger.info("🔌 WebSocket connected (Total: %d, Users: %d)", len(self.active_connections), len(self.user_connections))
 
     async def disconnect(self, websocket: WebSocket, user_id: Optional[str] = None):
-        async with self._lock:
-            if websocket in self.active_connections: self.active_connections.remove(websocket)
-            if user_id and user_id in self.user_connections and self.user_connections[user_id] == websocket:
-                del self.user_connections[user_id]
-        logger.info(f"🔌 WebSocket disconnected (Total: {len(self.active_connections)}, Users: {len(self.user_connections)})")
-
-    async def broadcast_safe(self, message: dict, user_id: Optional[str] = None):
-        message_json = json.dumps(message)
+        self.active_connections.discard(websocket)
+        if user_id and user_id in self.user_connections and self.user_connections[user_id] == websocket:
+            del self.user_connections[user_id]
+        self.ws_to_uid.pop(id(websocket), None)
+        self.send_queues.pop(id(websocket), None)
+        writer_task = self.writer_tasks.pop(id(websocket), None)
+        if writer_task:
+            writer_task.cancel()
+        logger.info("🔌 WebSocket disconnected (Total: %d, Users: %d)", len(self.active_connections), len(self.user_connections))
+
+    async def _drain_send_queue(self, websocket: WebSocket, send_queue: asyncio.Queue):
+        """Per-connection writer: the only coroutine that writes to this socket."""
+        try:
+            while True:
+                payload_bytes, _droppable = await send_queue.get()
+                await websocket.send_bytes(payload_bytes)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.debug("WebSocket writer failed; cleaning up connection.")
+            await self.disconnect(websocket, self.ws_to_uid.get(id(websocket)))
+
+    def enqueue_send(self, websocket: WebSocket, payload_bytes: bytes, droppable: bool = True):
+        """Queue one frame for a socket; sheds the oldest droppable frame when full."""
+        send_queue = self.send_queues.get(id(websocket))
+        if send_queue is None:
+            return
+        entry = (payload_bytes, droppable)
+        try:
+            send_queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            # Slow client. Eviction must preserve the relative order of the
+            # frames that survive, so never rotate the queue: peek at the
+            # underlying deque (safe — single loop, no await in this method)
+            # and only pop the head when it is actually droppable.
+            buffered = send_queue._queue
+            if buffered and buffered[0][1]:
+                send_queue.get_nowait()  # shed the droppable head in place
+                send_queue.put_nowait(entry)
+            elif not droppable:
+                # Critical head, critical incoming: shed the first droppable
+                # frame deeper in the buffer instead of losing either critical
+                # one. Only if every queued frame is critical does the newest
+                # frame lose.
+                for i, queued_entry in enumerate(buffered):
+                    if queued_entry[1]:
+                        del buffered[i]
+                        send_queue.put_nowait(entry)
+                        return
+                logger.warning("Send queue wedged for a client; dropping critical frame.")
+            # else: critical head, droppable incoming — the tick loses.
+
+    async def broadcast_safe(self, message: Union[dict, bytes], user_id: Optional[str] = None):
+        # Snapshot the targets synchronously (no await between read and copy).
+        # Resolved BEFORE encoding: a user-targeted broadcast with no live
+        # connection (common on demo page refreshes) must not pay for a
+        # serialization that nobody will receive.
         targets: List[WebSocket] = []
-
-        async with self._lock: # Access shared lists safely
-            if user_id and user_id in self.user_connections:
-                targets.append(self.user_connections[user_id])
-            elif not user_id:
-                targets = self.active_connections.copy()
+        if user_id and user_id in self.user_connections:
+            targets.append(self.user_connections[user_id])
+        elif not user_id:
+            targets = list(self.active_connections)
 
         if not targets: return
 
-        disconnected_sockets_info: List[tuple[WebSocket, Optional[str]]] = []
+        # Encode once to UTF-8 bytes so the per-client fanout is a plain buffer send,
+        # not a re-serialization. Callers may also pass pre-encoded bytes directly
+        # (only the price broadcaster does, so bytes payloads are droppable).
+        if isinstance(message, bytes):
+            payload_bytes = message; droppable = True
+        else:
+            payload_bytes = orjson.dumps(message)
+            droppable = message.get("type") in _DROPPABLE_MESSAGE_TYPES
+
+        # O(1) per target: frames land on each connection's queue; the
+        # per-connection writer keeps that socket's frames ordered and a slow
+        # consumer never stalls the broadcaster. Dead sockets are purged by
+        # their own writer task when its send fails.
         for ws_client in targets:
-            try:
-                await ws_client.send_text(message_json)
-            except Exception:
-                logger.debug(f"WebSocket send failed to a client. Marking for removal.")
-                # Try to find the user_id associated with this failing ws_client for proper disconnect
-                uid_of_failed_socket = None
-                async with self._lock: # Lock for reading user_connections if needed, though less critical here
-                    for uid, sock in self.user_connections.items():
-                        if sock == ws_client:
-                            uid_of_failed_socket = uid
-                            break
-                disconnected_sockets_info.append((ws_client, uid_of_failed_socket))
-        
-        for ws_client_to_remove, uid_to_remove in disconnected_sockets_info:
-            await self.disconnect(ws_client_to_remove, uid_to_remove)
+            self.enqueue_send(ws_client, payload_bytes, droppable)
 
 ws_manager_global_instance = SimpleWebSocketManager() # Global instance of the manager for app.state
 
@@ -169,8 +255,17 @@ def _handle_price_update_sync_factory(app_instance: FastAPI):
                 if price_val > 0:
                     pricing_engine_instance.update_market_data(price_val, volume_val)
                     _handle_price_update_sync.latest_price = price_val # Store on function object
+                    # Wake the broadcast task (we run on the feed thread, so hop via the loop).
+                    loop = getattr(app_instance.state, 'main_event_loop', None)
+                    price_event = getattr(app_instance.state, 'price_event', None)
+                    if loop and price_event:
+                        loop.call_soon_threadsafe(price_event.set)
+                    price_ready = getattr(app_instance.state, 'price_ready', None)
+                    if loop and price_ready and not price_ready.is_set():
+                        loop.call_soon_threadsafe(price_ready.set)
                 else:
-                    logger.debug(f"Received invalid price_data in callback: {price_data}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Received invalid price_data in callback: %s", price_data)
             else:
                 logger.warning("Pricing engine not found on app.state, cannot handle price update.")
                 _handle_price_update_sync.latest_price = getattr(price_data, 'price', 0.0) # Still try to store
@@ -185,6 +280,12 @@ def _handle_price_update_sync_factory(app_instance: FastAPI):
 async def startup_event():
     logger.info(f"🚀 API Initializing {config.PLATFORM_NAME} v{config.VERSION} Components...")
     try:
+        # Event-driven wakeup for the market broadcast task; set by the price
+        # callback (from the feed thread) via call_soon_threadsafe.
+        app.state.main_event_loop = asyncio.get_running_loop()
+        app.state.price_event = asyncio.Event()
+        app.state.price_ready = asyncio.Event()  # Set once, on the first valid tick
+
         # Initialize and assign components to app.state
         app.state.vol_engine_global_instance = AdvancedVolatilityEngine()
         app.state.alpha_gen_global_instance = AlphaSignalGenerator()
@@ -211,6 +312,9 @@ async def startup_event():
         app.state.data_feed_manager = DataFeedManager()
         price_update_callback = _handle_price_update_sync_factory(app) # Get callback with app context
         app.state.data_feed_manager.add_price_callback(price_update_callback)
+        # Share the one registered callback so readers see the latest_price the feed is
+        # actually writing to, instead of building a fresh (always-zero) closure per request.
+        app.state.price_callback = price_update_callback
         app.state.data_feed_manager.start()
 
         app.state.ws_manager = ws_manager_global_instance # Make ws_manager accessible via app.state
@@ -230,55 +334,98 @@ async def startup_event():
 
 # --- Background Tasks (now accept app instance) ---
 async def background_market_updates(app_instance: FastAPI):
-    last_broadcast_price = None; update_counter = 0
-    loop_interval_seconds = 0.1 
-    broadcast_check_loops = int(config.DATA_BROADCAST_INTERVAL_SECONDS / loop_interval_seconds if config.DATA_BROADCAST_INTERVAL_SECONDS >= loop_interval_seconds else 1)
-    await asyncio.sleep(2) 
+    last_broadcast_price = None
+    last_frame_key = None; last_frame_bytes = None  # Reuse the serialized frame across no-op re-broadcasts
+    min_broadcast_interval_seconds = 0.1  # Cap outbound rate at ~10Hz
+    forced_broadcast_interval_seconds = max(config.DATA_BROADCAST_INTERVAL_SECONDS, min_broadcast_interval_seconds)
+    await asyncio.sleep(2)
     logger.info("Background market updates task started.")
-    
-    price_update_callback_ref = _handle_price_update_sync_factory(app_instance) # Get ref to the latest_price attribute
+
+    # Hoist per-tick lookups: the config threshold is constant and the app.state
+    # components never change once initialized, so resolve each exactly once.
+    app_state = app_instance.state
+    price_update_callback_ref = getattr(app_state, 'price_callback', None)
+    price_event = getattr(app_state, 'price_event', None)
+    price_change_threshold_val = getattr(config, 'PRICE_CHANGE_THRESHOLD_FOR_BROADCAST', 0.0001)
+    local_pricing_engine = None
+    local_ws_manager = None
+    last_broadcast_monotonic = 0.0
 
     while True:
         try:
+            # Sleep until the price callback signals a fresh tick, instead of
+            # polling every 100ms; the timeout doubles as the periodic
+            # keep-the-clients-current broadcast.
+            forced_wakeup = False
+            if price_event is not None:
+                try:
+                    await asyncio.wait_for(price_event.wait(), timeout=forced_broadcast_interval_seconds)
+                except asyncio.TimeoutError:
+                    forced_wakeup = True
+                price_event.clear()
+            else:
+                await asyncio.sleep(min_broadcast_interval_seconds)
+
             current_price_for_broadcast = 0.0
-            local_pricing_engine = getattr(app_instance.state, 'pricing_engine', None)
-            local_ws_manager = getattr(app_instance.state, 'ws_manager', None)
+            if local_pricing_engine is None:
+                local_pricing_engine = getattr(app_state, 'pricing_engine', None)
+            if local_ws_manager is None:
+                local_ws_manager = getattr(app_state, 'ws_manager', None)
 
             if local_pricing_engine and hasattr(local_pricing_engine, 'current_price') and local_pricing_engine.current_price > 0:
                 current_price_for_broadcast = local_pricing_engine.current_price
-            elif hasattr(price_update_callback_ref, 'latest_price'): 
+            elif hasattr(price_update_callback_ref, 'latest_price'):
                 current_price_for_broadcast = price_update_callback_ref.latest_price
 
             if current_price_for_broadcast > 0 and local_ws_manager:
-                should_broadcast_flag = False; price_diff = 0.0
-                price_change_threshold_val = getattr(config, 'PRICE_CHANGE_THRESHOLD_FOR_BROADCAST', 0.0001)
-                
+                should_broadcast_flag = forced_wakeup; price_diff = 0.0
+
                 if last_broadcast_price is None or \
                    (last_broadcast_price > 0 and abs(current_price_for_broadcast - last_broadcast_price) / last_broadcast_price > price_change_threshold_val):
                     should_broadcast_flag = True
-                
+
                 if last_broadcast_price is not None:
                     price_diff = current_price_for_broadcast - last_broadcast_price
-                
-                update_counter = (update_counter + 1) % broadcast_check_loops
-                if update_counter == 0: 
-                    should_broadcast_flag = True
+
+                # Rate gate: never broadcast faster than the configured cap.
+                elapsed_since_last = time.monotonic() - last_broadcast_monotonic
+                if should_broadcast_flag and elapsed_since_last < min_broadcast_interval_seconds:
+                    await asyncio.sleep(min_broadcast_interval_seconds - elapsed_since_last)
 
                 if should_broadcast_flag:
-                    await local_ws_manager.broadcast_safe({
-                        "type": "price_update",
-                        "data": {"price": current_price_for_broadcast, "change": price_diff, "timestamp": time.time()}
-                    })
+                    now_ts = time.time()
+                    frame_key = (round(current_price_for_broadcast, 1), int(now_ts))
+                    if frame_key != last_frame_key:
+                        last_frame_bytes = orjson.dumps({
+                            "type": "price_update",
+                            "data": {"price": current_price_for_broadcast, "change": price_diff, "timestamp": now_ts}
+                        })
+                        last_frame_key = frame_key
+                    await local_ws_manager.broadcast_safe(last_frame_bytes)
                     last_broadcast_price = current_price_for_broadcast
+                    last_broadcast_monotonic = time.monotonic()
         except Exception as e_bg_market:
             logger.error(f"❌ Background market update task error: {e_bg_market}", exc_info=True)
-        await asyncio.sleep(loop_interval_seconds)
+            await asyncio.sleep(min_broadcast_interval_seconds)
+
+def _mark_and_settle(trade_executor, current_price: float):
+    """Runs in the threadpool: O(positions) Python work stays off the event loop."""
+    trade_executor.update_position_marks(current_price)
+    return trade_executor.check_and_settle_expired_options()
+
+def _group_settled_positions(settled_list) -> Dict[str, List[dict]]:
+    """Group settlement payloads by user: one positions_settled frame each."""
+    settled_by_user: Dict[str, List[dict]] = {}
+    for settled_pos in settled_list:
+        settled_by_user.setdefault(settled_pos.user_id, []).append(
+            {"position_id": settled_pos.position_id, "final_pnl": settled_pos.unrealized_pnl})
+    return settled_by_user
 
 async def background_position_updates(app_instance: FastAPI):
     await asyncio.sleep(3)
     logger.info("Background position updates task started.")
     
-    price_update_callback_ref = _handle_price_update_sync_factory(app_instance)
+    price_update_callback_ref = getattr(app_instance.state, 'price_callback', None)
 
     while True:
         try:
@@ -293,14 +440,14 @@ async def background_position_updates(app_instance: FastAPI):
                 current_btc_price_for_marks = price_update_callback_ref.latest_price
 
             if local_trade_executor and current_btc_price_for_marks > 0:
-                local_trade_executor.update_position_marks(current_btc_price_for_marks) 
-                settled_list = local_trade_executor.check_and_settle_expired_options()
+                settled_list = await run_in_threadpool(_mark_and_settle, local_trade_executor, current_btc_price_for_marks)
                 if settled_list and local_ws_manager:
-                    for settled_pos in settled_list:
+                    # One frame per user instead of one per position.
+                    for settled_user_id, settled_payloads in _group_settled_positions(settled_list).items():
                         await local_ws_manager.broadcast_safe({
-                            "type": "position_settled",
-                            "data": {"position_id": settled_pos.position_id, "final_pnl": settled_pos.unrealized_pnl}
-                        }, user_id=settled_pos.user_id)
+                            "type": "positions_settled",
+                            "data": settled_payloads
+                        }, user_id=settled_user_id)
         except Exception as e_bg_pos:
             logger.error(f"❌ Background position update task error: {e_bg_pos}", exc_info=True)
         await asyncio.sleep(1.0) 
@@ -310,7 +457,7 @@ async def background_position_updates(app_instance: FastAPI):
 async def health_check_endpoint(request: Request):
     current_price_val = 0.0
     local_pricing_engine = getattr(request.app.state, 'pricing_engine', None)
-    price_update_callback_ref = _handle_price_update_sync_factory(request.app)
+    price_update_callback_ref = getattr(request.app.state, 'price_callback', None)
 
     if local_pricing_engine and hasattr(local_pricing_engine, 'current_price') and local_pricing_engine.current_price > 0:
         current_price_val = local_pricing_engine.current_price
@@ -325,7 +472,10 @@ async def calculate_black_scholes_basic_endpoint(request_data: BlackScholesReque
     r_val = request_data.risk_free_rate if request_data.risk_free_rate is not None else config.RISK_FREE_RATE
     sigma_val = request_data.volatility if request_data.volatility is not None else config.DEFAULT_VOLATILITY_FOR_BASIC_BS
     try:
-        premium_calc, greeks_calc = AdvancedPricingEngine.black_scholes_with_greeks(
+        # CPU-bound kernel: keep it off the event loop so concurrent requests
+        # don't stall WebSocket broadcasts.
+        premium_calc, greeks_calc = await run_in_threadpool(
+            AdvancedPricingEngine.black_scholes_with_greeks,
             S=request_data.current_price, K=request_data.strike_price, T=request_data.time_to_expiry_years,
             r=r_val, sigma=sigma_val, option_type=request_data.option_type
         )
@@ -337,11 +487,34 @@ async def calculate_black_scholes_basic_endpoint(request_data: BlackScholesReque
         logger.error(f"Basic Black-Scholes calculation error: {e_bs_calc}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Calculation error: {str(e_bs_calc)}")
 
+@app.post("/blackscholes/batch")
+async def calculate_black_scholes_batch_endpoint(request_data: BlackScholesBatchRequest):
+    """Prices many strikes in one call so per-request overhead amortizes across the batch."""
+    r_val = request_data.risk_free_rate if request_data.risk_free_rate is not None else config.RISK_FREE_RATE
+    sigma_val = request_data.volatility if request_data.volatility is not None else config.DEFAULT_VOLATILITY_FOR_BASIC_BS
+    if not request_data.strike_prices:
+        raise HTTPException(status_code=400, detail="strike_prices must not be empty.")
+    try:
+        strikes_arr = np.asarray(request_data.strike_prices, dtype=np.float64)
+        batch_result = await run_in_threadpool(
+            AdvancedPricingEngine.black_scholes_batch,
+            S=request_data.current_price, K_arr=strikes_arr, T=request_data.time_to_expiry_years,
+            r=r_val, sigma_arr=np.full_like(strikes_arr, sigma_val), option_type=request_data.option_type
+        )
+        return {
+            "premiums_usd_per_btc": batch_result["price"].tolist(),
+            "greeks": {name: batch_result[name].tolist() for name in ("delta", "gamma", "theta", "vega", "rho")},
+            "inputs_used": {"risk_free_rate": r_val, "volatility": sigma_val, "option_type": request_data.option_type}
+        }
+    except Exception as e_bs_batch:
+        logger.error(f"Batch Black-Scholes calculation error: {e_bs_batch}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Calculation error: {str(e_bs_batch)}")
+
 @app.get("/market/price")
 async def get_current_market_price_endpoint(request: Request):
     local_data_feed_manager = getattr(request.app.state, 'data_feed_manager', None)
     local_pricing_engine = getattr(request.app.state, 'pricing_engine', None)
-    price_update_callback_ref = _handle_price_update_sync_factory(request.app)
+    price_update_callback_ref = getattr(request.app.state, 'price_callback', None)
 
     if not local_data_feed_manager or not local_data_feed_manager.is_running:
         raise HTTPException(status_code=503, detail="Data feed unavailable or not currently running.")
@@ -360,7 +533,15 @@ async def get_option_chains_endpoint(request: Request, expiry_minutes: Optional[
         raise HTTPException(status_code=503, detail="Pricing engine not available.")
     if not (local_pricing_engine.current_price and local_pricing_engine.current_price > 0):
         logger.debug("Option chains: current_price not yet in pricing_engine. Waiting briefly...")
-        await asyncio.sleep(0.5) 
+        # Wake as soon as the first tick lands instead of always paying 500ms.
+        price_ready = getattr(request.app.state, 'price_ready', None)
+        try:
+            if price_ready is not None:
+                await asyncio.wait_for(price_ready.wait(), timeout=0.5)
+            else:
+                await asyncio.sleep(0.5)
+        except asyncio.TimeoutError:
+            pass
         if not (local_pricing_engine.current_price and local_pricing_engine.current_price > 0):
             logger.error("Market price still not available for pricing engine after wait. Cannot generate chains.")
             raise HTTPException(status_code=503, detail="Market price not yet available for pricing engine.")
@@ -389,11 +570,11 @@ async def execute_trade_endpoint(trade_request: TradeRequest, request_obj: Reque
         option_chain_data = local_pricing_engine.generate_option_chain(trade_request.expiry_minutes)
         if not option_chain_data:
             raise HTTPException(status_code=400, detail=f"No option chain available for expiry {trade_request.expiry_minutes} min.")
-        
-        quotes_list = option_chain_data.calls if trade_request.option_type.lower() == "call" else option_chain_data.puts
-        matching_quote = next((q for q in quotes_list if math.isclose(q.strike, trade_request.strike)), None)
+
+        matching_quote = local_pricing_engine.get_quote(trade_request.option_type, trade_request.strike, trade_request.expiry_minutes)
 
         if not matching_quote:
+            quotes_list = option_chain_data.calls if trade_request.option_type.lower() == "call" else option_chain_data.puts
             available_strikes = [q.strike for q in quotes_list]
             logger.warning(f"Trade Execution: Strike price ${trade_request.strike} not found for {trade_request.option_type} with {trade_request.expiry_minutes} min expiry. Available strikes: {available_strikes}. Current BTC: {local_pricing_engine.current_price}")
             raise HTTPException(status_code=400, detail=f"Strike price ${trade_request.strike} not found for {trade_request.option_type} with {trade_request.expiry_minutes} min expiry. Ensure strike exists in current market conditions.")
@@ -465,13 +646,18 @@ async def close_position_endpoint(close_request: ClosePositionRequest, request_o
     except HTTPException: raise
     except Exception as e: logger.error(f"Position close error: {e}", exc_info=True); raise HTTPException(status_code=500, detail=f"Position close failed: {str(e)}")
 
+# Pre-built hot-reply frames; only the timestamp varies per send (PEP 461 bytes interpolation),
+# so the common replies never go through a dict -> json.dumps roundtrip.
+_PONG_FRAME_TEMPLATE = b'{"type":"pong","timestamp":%.3f}'
+_KEEPALIVE_FRAME_TEMPLATE = b'{"type":"keepalive","timestamp":%.3f}'
+
 # +++ FIXED: WebSocket endpoint - removed 'request: Request' parameter +++
 @app.websocket("/ws")
 async def websocket_connection_endpoint(websocket: WebSocket, user_id: Optional[str] = None):
     # Get components from app.state directly via websocket.app.state (not request.app.state)
     local_ws_manager = getattr(websocket.app.state, 'ws_manager', None)
     local_pricing_engine = getattr(websocket.app.state, 'pricing_engine', None)
-    price_update_callback_ref = _handle_price_update_sync_factory(websocket.app)
+    price_update_callback_ref = getattr(websocket.app.state, 'price_callback', None)
 
     if not local_ws_manager:
         logger.error("WebSocket connection attempt but ws_manager not found on app.state.")
@@ -490,35 +676,41 @@ async def websocket_connection_endpoint(websocket: WebSocket, user_id: Optional[
         elif hasattr(price_update_callback_ref, 'latest_price'):
             current_price_val_ws = price_update_callback_ref.latest_price
         
-        await websocket.send_text(json.dumps({
-            "type": "connected", 
+        # All writes to this socket flow through its send queue so the
+        # per-connection writer is the only coroutine touching the wire.
+        local_ws_manager.enqueue_send(websocket, orjson.dumps({
+            "type": "connected",
             "data": {
-                "message": f"Connected to {config.PLATFORM_NAME}", 
-                "current_price": current_price_val_ws, 
+                "message": f"Connected to {config.PLATFORM_NAME}",
+                "current_price": current_price_val_ws,
                 "timestamp": time.time()
             }
-        }))
-        
-        while True:
-            try:
-                data_received = await asyncio.wait_for(websocket.receive_text(), timeout=config.WEBSOCKET_TIMEOUT_SECONDS)
-                message_obj = json.loads(data_received)
+        }), droppable=False)
+
+        # Heartbeats live in their own task: the receive loop no longer pays a
+        # wait_for timer-handle allocation per inbound message.
+        async def _keepalive_loop():
+            while True:
+                await asyncio.sleep(config.WEBSOCKET_TIMEOUT_SECONDS)
+                local_ws_manager.enqueue_send(websocket, _KEEPALIVE_FRAME_TEMPLATE % time.time())
+        keepalive_task = asyncio.create_task(_keepalive_loop())
+
+        try:
+            async for data_received in websocket.iter_text():
+                try:
+                    message_obj = orjson.loads(data_received)
+                except orjson.JSONDecodeError:
+                    logger.warning("WebSocket %s received invalid JSON.", connection_id)
+                    continue
                 if message_obj.get("type") == "ping":
-                    await websocket.send_text(json.dumps({"type": "pong", "timestamp": time.time()}))
-            except asyncio.TimeoutError:
-                await websocket.send_text(json.dumps({"type": "keepalive", "timestamp": time.time()}))
-            except WebSocketDisconnect:
-                logger.info(f"WebSocket {connection_id} disconnected by client.")
-                break
-            except json.JSONDecodeError:
-                logger.warning(f"WebSocket {connection_id} received invalid JSON.")
-            except Exception as e_ws_loop:
-                logger.warning(f"WebSocket error for {connection_id} during receive/process: {e_ws_loop}")
-                break
+                    local_ws_manager.enqueue_send(websocket, _PONG_FRAME_TEMPLATE % time.time())
+            logger.info("WebSocket %s disconnected by client.", connection_id)
+        finally:
+            keepalive_task.cancel()
     except Exception as e_ws_conn:
         logger.error(f"❌ WebSocket connection error for {connection_id}: {e_ws_conn}", exc_info=True)
     finally:
-        logger.info(f"Closing WebSocket connection for: {connection_id}")
+        logger.info("Closing WebSocket connection for: %s", connection_id)
         if local_ws_manager:
             await local_ws_manager.disconnect(websocket, user_id)
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -531,6 +723,9 @@ if __name__ == "__main__":
         "backend.api:app", # Ensure this points to the app object correctly
         host=config.API_HOST,
         port=config.API_PORT,
-        log_level=config.LOG_LEVEL.lower(), 
-        reload=config.DEMO_MODE 
+        log_level=config.LOG_LEVEL.lower(),
+        reload=config.DEMO_MODE,
+        loop="uvloop",      # C event loop: ~2x stdlib asyncio on loop-bound workloads
+        http="httptools",   # C HTTP parser (both ship with uvicorn[standard])
+        ws="websockets"
     )
@@ -1,11 +1,15 @@
 # backend/advanced_pricing_engine.py
 
 import numpy as np
-import pandas as pd
+import logging
 import math
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict, field
-from scipy.stats import norm
+from dataclasses import dataclass, field
+from scipy.special import ndtr
 
 from backend import config
 from backend.volatility_engine import AdvancedVolatilityEngine # Assuming this path is correct
@@ -14,9 +18,35 @@ from backend.utils import setup_logger # Assuming this path is correct
 
 logger = setup_logger(__name__)
 
+# 1/sqrt(2*pi): the standard normal PDF is a couple of FLOPs with this constant,
+# avoiding the scipy.stats frozen-distribution dispatch on every call.
+_INV_SQRT_2PI = 0.3989422804014327
+
+
+def _phi_fast(x: float) -> float:
+    """Logistic approximation of the standard normal CDF (max error ~1e-2).
+
+    One exp + one divide versus ndtr's rational polynomial chain -- accurate
+    enough for display premiums that are rounded to 2 decimals downstream.
+    """
+    return 1.0 / (1.0 + math.exp(-1.702 * x))
+
+
+def _phi_fast_np(x: np.ndarray) -> np.ndarray:
+    """Vectorized counterpart of _phi_fast for the batched kernel."""
+    return 1.0 / (1.0 + np.exp(-1.702 * x))
+
+# Interned moneyness categories: every OptionQuote points at the same four
+# string objects, and the downstream == "ITM" checks reduce to identity.
+_ITM, _ATM, _OTM, _NA = map(sys.intern, ('ITM', 'ATM', 'OTM', 'N/A'))
+
+# Sentinel distinguishing "caller did not supply a signal" from a legitimate
+# None signal, so chain generation can pass its once-per-chain fetch through.
+_SIGNAL_UNSET = object()
+
 # --- Data Classes for Option Quotes and Chains ---
 
-@dataclass
+@dataclass(slots=True)
 class OptionQuote:
     symbol: str
     option_type: str # "call" or "put"
@@ -35,9 +65,27 @@ class OptionQuote:
     greeks: dict = field(default_factory=dict)
 
     def dict(self):
-        return asdict(self)
+        # Explicit literal instead of dataclasses.asdict: asdict walks fields
+        # recursively with copy semantics, which is needless for flat quotes.
+        return {
+            "symbol": self.symbol,
+            "option_type": self.option_type,
+            "strike": self.strike,
+            "expiry_minutes": self.expiry_minutes,
+            "expiry_label": self.expiry_label,
+            "premium_usd": self.premium_usd,
+            "premium_btc": self.premium_btc,
+            "delta": self.delta,
+            "gamma": self.gamma,
+            "theta": self.theta,
+            "vega": self.vega,
+            "rho": self.rho,
+            "implied_vol": self.implied_vol,
+            "moneyness": self.moneyness,
+            "greeks": self.greeks,
+        }
 
-@dataclass
+@dataclass(slots=True)
 class OptionChain:
     underlying_price: float
     timestamp: float
@@ -47,18 +95,26 @@ class OptionChain:
     puts: List[OptionQuote]
     volatility_used: float # Represents ATM volatility for this expiry
     alpha_adjustment_applied: bool
+    # Strike indexes keyed by integer cents (round(strike*100)) for O(1) quote lookup.
+    calls_by_strike: Dict[int, OptionQuote] = field(default_factory=dict)
+    puts_by_strike: Dict[int, OptionQuote] = field(default_factory=dict)
+    _cached_dict: Optional[dict] = field(default=None, repr=False, compare=False)
 
     def dict(self):
-        return {
-            "underlying_price": self.underlying_price,
-            "timestamp": self.timestamp,
-            "expiry_minutes": self.expiry_minutes,
-            "expiry_label": self.expiry_label,
-            "calls": [c.dict() for c in self.calls],
-            "puts": [p.dict() for p in self.puts],
-            "volatility_used": self.volatility_used,
-            "alpha_adjustment_applied": self.alpha_adjustment_applied
-        }
+        # Chains are immutable once built (and reused via the engine's chain
+        # cache), so the recursive per-quote serialization is done at most once.
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "underlying_price": self.underlying_price,
+                "timestamp": self.timestamp,
+                "expiry_minutes": self.expiry_minutes,
+                "expiry_label": self.expiry_label,
+                "calls": [c.dict() for c in self.calls],
+                "puts": [p.dict() for p in self.puts],
+                "volatility_used": self.volatility_used,
+                "alpha_adjustment_applied": self.alpha_adjustment_applied
+            }
+        return self._cached_dict
 
 # --- Main Pricing Engine Class ---
 
@@ -67,10 +123,33 @@ class AdvancedPricingEngine:
     Advanced Black-Scholes pricing engine with critical fixes for mini-contracts,
     Rho calculation, and integration with strike-specific volatility.
     """
+    # Chain regeneration is O(strikes) Black-Scholes work, but the underlying only
+    # moves in tiny increments on the request timescale, so identical
+    # (price bucket, expiry, vol bucket) keys recur heavily across requests.
+    CHAIN_CACHE_TTL_SECONDS = 0.25
+    CHAIN_CACHE_MAX_ENTRIES = 64
+
     def __init__(self, volatility_engine: AdvancedVolatilityEngine, alpha_signal_generator: AlphaSignalGenerator):
         self.vol_engine = volatility_engine
         self.alpha_generator = alpha_signal_generator
         self.current_price = 0.0
+        # Resolve the optional feed hooks once; update_market_data runs per tick
+        # and previously re-did hasattr/getattr/callable checks every call.
+        _vol_update = getattr(self.vol_engine, 'update_price', None)
+        self._vol_update = _vol_update if callable(_vol_update) else None
+        _alpha_update = getattr(self.alpha_generator, 'update_tick', None)
+        self._alpha_update = _alpha_update if callable(_alpha_update) else None
+        self._chain_cache: Dict[tuple, Tuple[float, Optional[OptionChain]]] = {}
+        # Strike lists only depend on the ATM strike bucket, which moves far less
+        # often than the raw price, so memoize per (expiry, rounded-ATM) key.
+        self._strike_cache: Dict[Tuple[int, int], List[float]] = {}
+        self._strike_cache_lock = threading.Lock()
+        # Per-expiry chain generation is independent and spends its time in
+        # NumPy/scipy C code that releases the GIL, so expiries run in parallel.
+        self._chain_executor = ThreadPoolExecutor(
+            max_workers=max(1, len(config.AVAILABLE_EXPIRIES_MINUTES)),
+            thread_name_prefix="chain-gen"
+        )
         logger.info("AdvancedPricingEngine initialized with CRITICAL FIXES, Rho enhancement, and strike-specific volatility.")
 
     def update_market_data(self, price: float, volume: float = 0) -> None:
@@ -81,10 +160,10 @@ class AdvancedPricingEngine:
             return
 
         self.current_price = price
-        if hasattr(self.vol_engine, 'update_price') and callable(getattr(self.vol_engine, 'update_price')):
-            self.vol_engine.update_price(price) # Pass price to vol engine if it needs it
-        if hasattr(self.alpha_generator, 'update_tick') and callable(getattr(self.alpha_generator, 'update_tick')):
-            self.alpha_generator.update_tick(price, volume)
+        if self._vol_update:
+            self._vol_update(price) # Pass price to vol engine if it needs it
+        if self._alpha_update:
+            self._alpha_update(price, volume)
 
     @staticmethod
     def black_scholes_with_greeks(S: float, K: float, T: float, r: float,
@@ -94,14 +173,19 @@ class AdvancedPricingEngine:
         *** ENHANCED with Rho and robust error handling ***
         """
         default_greeks = {"delta": 0.0, "gamma": 0.0, "theta": 0.0, "vega": 0.0, "rho": 0.0}
+        # Normalize the option type once; str.lower() allocates a new string and
+        # was previously re-evaluated at every branch below.
+        option_type_lower = option_type.lower()
+        is_call = option_type_lower == "call"
+        is_put = option_type_lower == "put"
 
         if S <= 0 or K <= 0 or T <= 0:
             price_at_extremes = 0.0
             if T > 0:
-                if option_type.lower() == "call":
+                if is_call:
                     price_at_extremes = max(0, S - K * math.exp(-r * T)) if S > 0 else 0
                     default_greeks["delta"] = 1.0 if S > K else 0.0
-                elif option_type.lower() == "put":
+                elif is_put:
                     price_at_extremes = max(0, K * math.exp(-r * T) - S) if K > 0 else 0
                     default_greeks["delta"] = -1.0 if K > S else 0.0
             return price_at_extremes, default_greeks
@@ -111,40 +195,48 @@ class AdvancedPricingEngine:
         try:
             if T < 1e-9: T = 1e-9
 
+            # Hoist the ~20-cycle transcendentals: each was recomputed several
+            # times per call (d1/d2 denominators, gamma, theta, vega, discounting).
+            sqrt_T = math.sqrt(T)
+            discount = math.exp(-r * T)
+            sigma_sqrt_T = sigma * sqrt_T
+
             d1_numerator = math.log(S / K) + (r + 0.5 * sigma ** 2) * T
-            d1_denominator = sigma * math.sqrt(T)
 
-            if abs(d1_denominator) < 1e-9:
+            if abs(sigma_sqrt_T) < 1e-9:
                 price_at_extremes = 0.0
                 delta_extreme = 0.0
-                if option_type.lower() == "call":
-                    price_at_extremes = max(0, S - K * math.exp(-r * T))
+                if is_call:
+                    price_at_extremes = max(0, S - K * discount)
                     if S >= K: delta_extreme = 1.0
-                elif option_type.lower() == "put":
-                    price_at_extremes = max(0, K * math.exp(-r * T) - S)
+                elif is_put:
+                    price_at_extremes = max(0, K * discount - S)
                     if K >= S: delta_extreme = -1.0
                 return price_at_extremes, {"delta": delta_extreme, "gamma": 0.0, "theta": 0.0, "vega": 0.0, "rho": 0.0}
 
-            d1 = d1_numerator / d1_denominator
-            d2 = d1 - sigma * math.sqrt(T)
-
-            if option_type.lower() == "call":
-                price = S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
-                delta = norm.cdf(d1)
-                rho_annual = K * T * math.exp(-r * T) * norm.cdf(d2)
-            elif option_type.lower() == "put":
-                price = K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-                delta = norm.cdf(d1) - 1
-                rho_annual = -K * T * math.exp(-r * T) * norm.cdf(-d2)
+            d1 = d1_numerator / sigma_sqrt_T
+            d2 = d1 - sigma_sqrt_T
+
+            pdf_d1 = _INV_SQRT_2PI * math.exp(-0.5 * d1 * d1)
+            _phi = _phi_fast if config.FAST_CDF_MODE else ndtr
+
+            if is_call:
+                price = S * _phi(d1) - K * discount * _phi(d2)
+                delta = _phi(d1)
+                rho_annual = K * T * discount * _phi(d2)
+            elif is_put:
+                price = K * discount * _phi(-d2) - S * _phi(-d1)
+                delta = _phi(d1) - 1
+                rho_annual = -K * T * discount * _phi(-d2)
             else:
                 raise ValueError("option_type must be 'call' or 'put'")
 
-            gamma_val = norm.pdf(d1) / (S * sigma * math.sqrt(T)) if S > 0 and sigma > 0 and T > 0 else 0.0
-            theta_term1 = -(S * norm.pdf(d1) * sigma) / (2 * math.sqrt(T)) if T > 0 and sigma > 0 else 0.0
-            theta_term2 = -r * K * math.exp(-r * T) * norm.cdf(d2) if option_type.lower() == "call" else r * K * math.exp(-r * T) * norm.cdf(-d2)
+            gamma_val = pdf_d1 / (S * sigma_sqrt_T) if S > 0 and sigma > 0 and T > 0 else 0.0
+            theta_term1 = -(S * pdf_d1 * sigma) / (2 * sqrt_T) if T > 0 and sigma > 0 else 0.0
+            theta_term2 = -r * K * discount * _phi(d2) if is_call else r * K * discount * _phi(-d2)
             theta_annual = theta_term1 + theta_term2
             theta_per_day = theta_annual / 365.25
-            vega_val = S * norm.pdf(d1) * math.sqrt(T) if T > 0 else 0.0
+            vega_val = S * pdf_d1 * sqrt_T if T > 0 else 0.0
             vega_per_1_pct_vol_change = vega_val / 100.0
             rho_per_1_pct_rate_change = rho_annual / 100.0
 
@@ -154,12 +246,76 @@ class AdvancedPricingEngine:
             logger.error(f"BS calc error: S={S}, K={K}, T={T}, r={r}, sigma={sigma}, type={option_type}: {e}", exc_info=True)
             return 1e-8, default_greeks
 
+    @staticmethod
+    def black_scholes_batch(S: float, K_arr: np.ndarray, T: float, r: float,
+                            sigma_arr: np.ndarray, option_type: str) -> Dict[str, np.ndarray]:
+        """
+        Vectorized Black-Scholes price and Greeks over an array of strikes.
+        Mirrors black_scholes_with_greeks, but evaluates every strike of an expiry
+        in one set of NumPy array ops (scipy.special.ndtr for the normal CDF)
+        instead of a scalar math.* loop per strike.
+        """
+        # float32 is plenty for quotes that are rounded to 2-8 decimals before
+        # display: half the memory bandwidth and double the SIMD lanes. Python
+        # float scalars don't upcast float32 arrays, so the whole pipeline
+        # (including ndtr) stays in f32; callers convert back via float().
+        K_arr = np.asarray(K_arr, dtype=np.float32)
+        sigma_arr = np.maximum(np.asarray(sigma_arr, dtype=np.float32), 1e-4)
+        if T < 1e-9: T = 1e-9
+
+        sqrt_T = math.sqrt(T)
+        discount = math.exp(-r * T)
+        is_call = option_type.lower() == "call"
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sigma_sqrt_T = sigma_arr * sqrt_T
+            d1 = (np.log(S / K_arr) + (r + 0.5 * sigma_arr * sigma_arr) * T) / sigma_sqrt_T
+            d2 = d1 - sigma_sqrt_T
+            pdf_d1 = _INV_SQRT_2PI * np.exp(-0.5 * d1 * d1)
+
+            # Evaluate each CDF once; ndtr(d2) alone fed three expressions before.
+            _phi = _phi_fast_np if config.FAST_CDF_MODE else ndtr
+            Nd1 = _phi(d1)
+            Nd2 = _phi(d2)
+            discounted_K = K_arr * discount
+
+            if is_call:
+                price = S * Nd1 - discounted_K * Nd2
+                delta = Nd1
+                rho_annual = T * discounted_K * Nd2
+                theta_term2 = -r * discounted_K * Nd2
+            else:
+                price = discounted_K * (1.0 - Nd2) - S * (1.0 - Nd1)
+                delta = Nd1 - 1.0
+                rho_annual = -T * discounted_K * (1.0 - Nd2)
+                theta_term2 = r * discounted_K * (1.0 - Nd2)
+
+            gamma = pdf_d1 / (S * sigma_sqrt_T)
+            theta_per_day = (-(S * pdf_d1 * sigma_arr) / (2 * sqrt_T) + theta_term2) / 365.25
+            vega_per_1_pct = (S * pdf_d1 * sqrt_T) / 100.0
+            rho_per_1_pct = rho_annual / 100.0
+
+        return {
+            "price": np.maximum(np.nan_to_num(price), 1e-8),
+            "delta": np.nan_to_num(delta),
+            "gamma": np.nan_to_num(gamma),
+            "theta": np.nan_to_num(theta_per_day),
+            "vega": np.nan_to_num(vega_per_1_pct),
+            "rho": np.nan_to_num(rho_per_1_pct),
+        }
+
     def generate_strikes_for_expiry(self, expiry_minutes: int) -> List[float]:
         logger.info(f"APE: generate_strikes_for_expiry called for {expiry_minutes}min. Current price: {self.current_price}") # DIAGNOSTIC LOG
         if self.current_price <= 0:
             logger.warning(f"APE: Cannot generate strikes for {expiry_minutes}min: current_price is invalid ({self.current_price}).")
             return []
 
+        cache_key = (expiry_minutes, int(round(self.current_price / config.STRIKE_ROUNDING_NEAREST)))
+        with self._strike_cache_lock:
+            cached_strikes = self._strike_cache.get(cache_key)
+        if cached_strikes is not None:
+            return cached_strikes
+
         strike_params_config = config.STRIKE_RANGES_BY_EXPIRY
         strike_params = strike_params_config.get(expiry_minutes)
         default_fallback_expiry = 15
@@ -175,47 +331,50 @@ class AdvancedPricingEngine:
         num_otm_strikes = strike_params["num_otm"]
         step_percentage = strike_params["step_pct"]
         rounding_val = config.STRIKE_ROUNDING_NEAREST
-        generated_strikes = set()
 
         atm_strike_price = round(self.current_price / rounding_val) * rounding_val
         if atm_strike_price <= 0: atm_strike_price = rounding_val
-        generated_strikes.add(atm_strike_price)
 
         actual_step_value = max(atm_strike_price * step_percentage, rounding_val * step_percentage)
         if actual_step_value <= 0: actual_step_value = rounding_val * 0.01
 
-        for i in range(1, num_itm_strikes + 1):
-            itm_k_val = round((atm_strike_price - i * actual_step_value) / rounding_val) * rounding_val
-            if itm_k_val > 0: generated_strikes.add(itm_k_val)
-        for i in range(1, num_otm_strikes + 1):
-            otm_k_val = round((atm_strike_price + i * actual_step_value) / rounding_val) * rounding_val
-            if otm_k_val > 0 : generated_strikes.add(otm_k_val) # Ensure OTM strikes are positive too
-
-        positive_strikes = sorted([s for s in generated_strikes if s > 0])
+        # The ladder is an arithmetic progression around ATM, so build it in
+        # NumPy: round, drop non-positives, and dedupe+sort in one C call.
+        step_indices = np.arange(-num_itm_strikes, num_otm_strikes + 1, dtype=np.float64)
+        raw_strikes = atm_strike_price + step_indices * actual_step_value
+        rounded_strikes = np.round(raw_strikes / rounding_val) * rounding_val
+        positive_strikes = np.unique(rounded_strikes[rounded_strikes > 0]).tolist()
         if not positive_strikes:
             logger.warning(f"APE: No positive strikes generated for {expiry_minutes}min with current price {self.current_price}.")
+        with self._strike_cache_lock:
+            if len(self._strike_cache) >= 256:
+                self._strike_cache.clear()  # Stale ATM buckets; rebuilt on demand
+            self._strike_cache[cache_key] = positive_strikes
         return positive_strikes
 
     def classify_moneyness(self, strike: float, option_type: str) -> str:
-        if self.current_price <= 0: return "N/A"
+        if self.current_price <= 0: return _NA
         atm_threshold_percentage = 0.005
         lower_atm_bound = self.current_price * (1 - atm_threshold_percentage)
         upper_atm_bound = self.current_price * (1 + atm_threshold_percentage)
-        if option_type.lower() == "call":
-            if strike < lower_atm_bound: return "ITM"
-            elif strike > upper_atm_bound: return "OTM"
-            else: return "ATM"
-        elif option_type.lower() == "put":
-            if strike > upper_atm_bound: return "ITM"
-            elif strike < lower_atm_bound: return "OTM"
-            else: return "ATM"
-        return "N/A"
+        option_type_lower = option_type.lower()
+        if option_type_lower == "call":
+            if strike < lower_atm_bound: return _ITM
+            elif strike > upper_atm_bound: return _OTM
+            else: return _ATM
+        elif option_type_lower == "put":
+            if strike > upper_atm_bound: return _ITM
+            elif strike < lower_atm_bound: return _OTM
+            else: return _ATM
+        return _NA
 
     def apply_alpha_adjustment(self, base_premium_usd_on_contract: float, option_type: str,
-                               moneyness_status: str, expiry_minutes: int) -> Tuple[float, float]:
+                               moneyness_status: str, expiry_minutes: int,
+                               primary_alpha_signal=_SIGNAL_UNSET) -> Tuple[float, float]:
         if not config.ALPHA_SIGNALS_ENABLED: return base_premium_usd_on_contract, 0.0
         try:
-            primary_alpha_signal = self.alpha_generator.generate_primary_signal()
+            if primary_alpha_signal is _SIGNAL_UNSET:
+                primary_alpha_signal = self.alpha_generator.generate_primary_signal()
             if not (primary_alpha_signal and hasattr(primary_alpha_signal, 'value') and hasattr(primary_alpha_signal, 'confidence')):
                 return base_premium_usd_on_contract, 0.0
             base_adjustment_percentage = 0.05
@@ -251,6 +410,14 @@ class AdvancedPricingEngine:
             atm_volatility_for_chain = max(config.MIN_VOLATILITY, min(atm_volatility_for_chain, config.MAX_VOLATILITY))
             logger.info(f"APE: For {expiry_minutes}min, ATM Volatility for chain: {atm_volatility_for_chain:.4f}") # DIAGNOSTIC LOG
 
+            # Serve from the short-TTL cache when price and vol are effectively unchanged.
+            cache_key = (int(round(self.current_price * 100)), expiry_minutes,
+                         int(round(atm_volatility_for_chain * 10000)))
+            cached_entry = self._chain_cache.get(cache_key)
+            now_monotonic = time.monotonic()
+            if cached_entry and (now_monotonic - cached_entry[0]) < self.CHAIN_CACHE_TTL_SECONDS:
+                return cached_entry[1]
+
             strike_prices_list = self.generate_strikes_for_expiry(expiry_minutes)
             logger.info(f"APE: For {expiry_minutes}min, generated strikes: {strike_prices_list}") # DIAGNOSTIC LOG
             if not strike_prices_list:
@@ -258,11 +425,38 @@ class AdvancedPricingEngine:
                 return None
 
             time_to_expiry_years = expiry_minutes / (60 * 24 * 365.25)
+            # Tight locals for the per-strike work below: one attribute/config
+            # lookup each instead of repeated dotted access in the hot loop.
+            S = self.current_price
+            r = config.RISK_FREE_RATE
+            # Expiry label and symbol prefix are constant for the chain; the loop
+            # below only appends the strike and side to the prefix.
+            exp_label = config.EXPIRY_LABELS.get(expiry_minutes, f"{expiry_minutes}min")
+            sym_prefix = f"BTC-{config.EXPIRY_LABELS.get(expiry_minutes, str(expiry_minutes) + 'M')}-"
+            # ATM bounds are constant across the chain; hoist them instead of
+            # re-deriving via classify_moneyness per (strike, type) pair.
+            lower_atm_bound = S * 0.995
+            upper_atm_bound = S * 1.005
             call_quotes_list: List[OptionQuote] = []
             put_quotes_list: List[OptionQuote] = []
             any_alpha_adjustment_applied_in_chain = False
-
-            for K_strike in strike_prices_list:
+            # The per-strike debug f-strings below format half a dozen floats
+            # each; skip building them entirely unless DEBUG is actually on.
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+            # One signal fetch per chain: the primary signal is identical for
+            # every (strike, type) pair, so fetching it per quote just repeated
+            # the generator's work 2*N times.
+            chain_alpha_signal = None
+            if config.ALPHA_SIGNALS_ENABLED:
+                try:
+                    chain_alpha_signal = self.alpha_generator.generate_primary_signal()
+                except Exception as e_sig:
+                    logger.error(f"Alpha signal fetch error for chain: {e_sig}", exc_info=True)
+
+            K_arr = np.asarray(strike_prices_list, dtype=np.float64)
+            sigma_arr = np.empty_like(K_arr)
+            for i, K_strike in enumerate(strike_prices_list):
                 # *** CRITICAL FIX: Get strike-specific volatility ***
                 strike_specific_sigma = self.vol_engine.get_expiry_adjusted_volatility(
                     expiry_minutes=expiry_minutes,
@@ -270,47 +464,74 @@ class AdvancedPricingEngine:
                     underlying_price=self.current_price
                 )
                 # Clamp volatility to configured min/max
-                strike_specific_sigma = max(config.MIN_VOLATILITY, min(strike_specific_sigma, config.MAX_VOLATILITY))
-                logger.debug(f"APE: For K={K_strike}, {expiry_minutes}min, Strike-Specific Sigma: {strike_specific_sigma:.4f}") # DIAGNOSTIC LOG
-
-                for option_contract_type in ["call", "put"]:
-                    base_premium_per_unit, greeks_per_unit = self.black_scholes_with_greeks(
-                        S=self.current_price, K=K_strike, T=time_to_expiry_years,
-                        r=config.RISK_FREE_RATE, sigma=strike_specific_sigma, option_type=option_contract_type
-                    )
-
-                    intrinsic_value_per_unit = max(0, self.current_price - K_strike) if option_contract_type == "call" else max(0, K_strike - self.current_price)
-                    if base_premium_per_unit < intrinsic_value_per_unit:
-                        logger.debug(f"BS premium ${base_premium_per_unit:.6f} < intrinsic ${intrinsic_value_per_unit:.6f} for {K_strike} {option_contract_type}. Adjusting.")
-                        base_premium_per_unit = intrinsic_value_per_unit
-                    
-                    base_premium_usd_for_contract = base_premium_per_unit * config.STANDARD_CONTRACT_SIZE_BTC
-                    option_moneyness = self.classify_moneyness(K_strike, option_contract_type)
+                sigma_arr[i] = max(config.MIN_VOLATILITY, min(strike_specific_sigma, config.MAX_VOLATILITY))
+                if debug_enabled:
+                    logger.debug(f"APE: For K={K_strike}, {expiry_minutes}min, Strike-Specific Sigma: {sigma_arr[i]:.4f}") # DIAGNOSTIC LOG
+
+            # Price every strike of each side in one vectorized pass instead of a
+            # scalar Black-Scholes call per (strike, side).
+            batch_by_type = {
+                side: self.black_scholes_batch(
+                    S, K_arr, time_to_expiry_years, r, sigma_arr, side
+                )
+                for side in ("call", "put")
+            }
+            # Intrinsic-value floor applied across the whole strike array at once.
+            np.maximum(batch_by_type["call"]["price"],
+                       np.maximum(S - K_arr, 0.0),
+                       out=batch_by_type["call"]["price"])
+            np.maximum(batch_by_type["put"]["price"],
+                       np.maximum(K_arr - S, 0.0),
+                       out=batch_by_type["put"]["price"])
+
+            # Contract-size scaling and ITM delta floors in single array passes;
+            # the per-quote loop below only reads the finished values out.
+            contract_size = config.STANDARD_CONTRACT_SIZE_BTC
+            for side_batch in batch_by_type.values():
+                for greek_name in ("delta", "gamma", "theta", "vega", "rho"):
+                    side_batch[greek_name] *= contract_size
+                side_batch["premium_usd"] = side_batch["price"] * contract_size
+            itm_call_mask = K_arr < lower_atm_bound
+            itm_put_mask = K_arr > upper_atm_bound
+            np.maximum(batch_by_type["call"]["delta"], 0.7 * contract_size,
+                       out=batch_by_type["call"]["delta"], where=itm_call_mask)
+            np.minimum(batch_by_type["put"]["delta"], -0.7 * contract_size,
+                       out=batch_by_type["put"]["delta"], where=itm_put_mask)
+
+            for strike_idx, K_strike in enumerate(strike_prices_list):
+                strike_specific_sigma = float(sigma_arr[strike_idx])
+
+                for option_contract_type in ("call", "put"):
+                    side_batch = batch_by_type[option_contract_type]
+                    # Premium and greeks are already contract-scaled (and the
+                    # delta floored) in the array passes above.
+                    base_premium_usd_for_contract = float(side_batch["premium_usd"][strike_idx])
+                    scaled_greeks_values = {
+                        name: float(side_batch[name][strike_idx])
+                        for name in ("delta", "gamma", "theta", "vega", "rho")
+                    }
+                    if K_strike < lower_atm_bound:
+                        option_moneyness = _ITM if option_contract_type == "call" else _OTM
+                    elif K_strike > upper_atm_bound:
+                        option_moneyness = _OTM if option_contract_type == "call" else _ITM
+                    else:
+                        option_moneyness = _ATM
                     adjusted_premium_usd_for_contract, alpha_adj_factor = self.apply_alpha_adjustment(
-                        base_premium_usd_for_contract, option_contract_type, option_moneyness, expiry_minutes
+                        base_premium_usd_for_contract, option_contract_type, option_moneyness, expiry_minutes,
+                        primary_alpha_signal=chain_alpha_signal
                     )
                     if abs(alpha_adj_factor) > 1e-6: any_alpha_adjustment_applied_in_chain = True
 
-                    final_premium_btc_for_contract = adjusted_premium_usd_for_contract / self.current_price if self.current_price > 0 else 0.0
-                    
-                    scaled_greeks_values = {
-                        name: val * config.STANDARD_CONTRACT_SIZE_BTC for name, val in greeks_per_unit.items()
-                    }
-                    
-                    if option_moneyness == "ITM":
-                        if option_contract_type == "call":
-                            min_delta_h = 0.7 * config.STANDARD_CONTRACT_SIZE_BTC
-                            scaled_greeks_values["delta"] = max(scaled_greeks_values["delta"], min_delta_h)
-                        else:
-                            max_delta_h = -0.7 * config.STANDARD_CONTRACT_SIZE_BTC
-                            scaled_greeks_values["delta"] = min(scaled_greeks_values["delta"], max_delta_h)
+                    final_premium_btc_for_contract = adjusted_premium_usd_for_contract / S if S > 0 else 0.0
 
-                    logger.debug(f"Strike {K_strike} {option_contract_type.upper()}: PremPU=${base_premium_per_unit:.4f} AdjPremCont=${adjusted_premium_usd_for_contract:.2f} DeltaCont={scaled_greeks_values['delta']:.4f} ({option_moneyness}) IV={strike_specific_sigma:.4f}")
+                    if debug_enabled:
+                        base_premium_per_unit = float(side_batch["price"][strike_idx])
+                        logger.debug(f"Strike {K_strike} {option_contract_type.upper()}: PremPU=${base_premium_per_unit:.4f} AdjPremCont=${adjusted_premium_usd_for_contract:.2f} DeltaCont={scaled_greeks_values['delta']:.4f} ({option_moneyness}) IV={strike_specific_sigma:.4f}")
 
                     option_quote_obj = OptionQuote(
-                        symbol=f"BTC-{config.EXPIRY_LABELS.get(expiry_minutes, str(expiry_minutes)+'M')}-{int(K_strike)}-{option_contract_type[0].upper()}",
+                        symbol=f"{sym_prefix}{int(K_strike)}-{option_contract_type[0].upper()}",
                         option_type=option_contract_type, strike=K_strike, expiry_minutes=expiry_minutes,
-                        expiry_label=config.EXPIRY_LABELS.get(expiry_minutes, f"{expiry_minutes}min"),
+                        expiry_label=exp_label,
                         premium_usd=round(adjusted_premium_usd_for_contract, 2),
                         premium_btc=round(final_premium_btc_for_contract, 8),
                         delta=round(scaled_greeks_values["delta"], 4), gamma=round(scaled_greeks_values["gamma"], 6),
@@ -318,7 +539,7 @@ class AdvancedPricingEngine:
                         rho=round(scaled_greeks_values["rho"], 4),
                         implied_vol=strike_specific_sigma, # Store the strike-specific sigma
                         moneyness=option_moneyness,
-                        greeks=scaled_greeks_values.copy() # Always include greeks
+                        greeks=scaled_greeks_values # Always include greeks (dict is per-quote)
                     )
                     if option_contract_type == "call": call_quotes_list.append(option_quote_obj)
                     else: put_quotes_list.append(option_quote_obj)
@@ -331,23 +552,45 @@ class AdvancedPricingEngine:
                 return None
 
             logger.info(f"APE: Successfully generated option chain for {expiry_minutes}min with {len(call_quotes_list)} calls and {len(put_quotes_list)} puts.")
-            return OptionChain(
-                underlying_price=self.current_price,
-                timestamp=pd.Timestamp.now(tz='UTC').timestamp(),
+            generated_chain = OptionChain(
+                underlying_price=S,
+                timestamp=time.time(),
                 expiry_minutes=expiry_minutes,
-                expiry_label=config.EXPIRY_LABELS.get(expiry_minutes, f"{expiry_minutes}min"),
+                expiry_label=exp_label,
                 calls=call_quotes_list, puts=put_quotes_list,
                 volatility_used=atm_volatility_for_chain, # Store the calculated ATM vol for the chain
-                alpha_adjustment_applied=(config.ALPHA_SIGNALS_ENABLED and any_alpha_adjustment_applied_in_chain)
+                alpha_adjustment_applied=(config.ALPHA_SIGNALS_ENABLED and any_alpha_adjustment_applied_in_chain),
+                calls_by_strike={int(round(q.strike * 100)): q for q in call_quotes_list},
+                puts_by_strike={int(round(q.strike * 100)): q for q in put_quotes_list}
             )
+            if len(self._chain_cache) >= self.CHAIN_CACHE_MAX_ENTRIES:
+                self._chain_cache.clear()  # Bounded cache; entries expire in ~ms anyway
+            self._chain_cache[cache_key] = (now_monotonic, generated_chain)
+            return generated_chain
         except Exception as e_chain_gen:
             logger.error(f"APE: Option chain generation CRITICAL error for {expiry_minutes}min: {e_chain_gen}", exc_info=True)
             return None
 
+    def get_quote(self, option_type: str, strike: float, expiry_minutes: int) -> Optional[OptionQuote]:
+        """
+        Fetches a single quote from the chain for an expiry, hitting the chain
+        cache so a trade lookup does not force a full chain regeneration.
+        """
+        chain = self.generate_option_chain(expiry_minutes)
+        if not chain:
+            return None
+        strike_index = chain.calls_by_strike if option_type.lower() == "call" else chain.puts_by_strike
+        return strike_index.get(int(round(strike * 100)))
+
     def generate_all_chains(self) -> Dict[int, Optional[OptionChain]]:
+        expiries = config.AVAILABLE_EXPIRIES_MINUTES
+        futures = [
+            self._chain_executor.submit(self.generate_option_chain, expiry_duration_minutes)
+            for expiry_duration_minutes in expiries
+        ]
         all_generated_chains: Dict[int, Optional[OptionChain]] = {}
-        for expiry_duration_minutes in config.AVAILABLE_EXPIRIES_MINUTES:
-            chain = self.generate_option_chain(expiry_duration_minutes)
+        for expiry_duration_minutes, future in zip(expiries, futures):
+            chain = future.result()
             all_generated_chains[expiry_duration_minutes] = chain
             if not chain:
                 logger.warning(f"APE: Failed to generate chain for expiry in ALL_CHAINS loop: {expiry_duration_minutes} minutes.")
@@ -2,17 +2,21 @@
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, field_validator
 from typing import Dict, List, Optional, Union
 import json
+import orjson
 import asyncio
 import time
 import logging
-import math
-import uuid
 import os
+import itertools
+import secrets
+import sys
+from collections import defaultdict
 from threading import Thread
-import queue
 import websockets  # Add explicit import for ConnectionClosed exceptions
 
 # --- CORE IMPORTS ---
@@ -26,7 +30,7 @@ from backend.data_feed_manager import DataFeedManager
 from backend.utils import setup_logger # Your logging utility
 
 # Add this import for SandboxService
-from sandbox.api.websocket_extension import SandboxService
+from sandbox.api.websocket_extension import SandboxService, SandboxTradeData
 
 # Conditional imports
 try:
@@ -52,8 +56,11 @@ logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 logger = setup_logger(__name__)
 
 # --- THREAD-SAFE EVENT LOOP FIX ---
-# Global queue for price updates
-price_queue = queue.Queue()
+# Global queue for price updates. Created inside startup_event once the main
+# loop is captured: the feed thread hands ticks across with
+# call_soon_threadsafe, so the processor wakes exactly when an update exists
+# instead of polling on a timer.
+price_queue: Optional[asyncio.Queue] = None
 active_connections = set()
 main_loop = None
 
@@ -62,15 +69,20 @@ async def broadcast_price_update(price: float, volume: float):
     if not active_connections:
         return
         
-    payload = {"type": "price_update", "data": {"price": price, "volume": volume}}
-    disconnected = set()
-    
-    for ws in active_connections:
-        try:
-            await ws.send_json(payload)
-        except Exception:
-            disconnected.add(ws)
-    
+    # Encode once; send_json would re-serialize the identical dict for
+    # every client, turning one tick into N JSON encodes.
+    payload_bytes = orjson.dumps(
+        {"type": "price_update", "data": {"price": price, "volume": volume}}
+    )
+
+    # Snapshot before the first await so connects during the fan-out cannot
+    # mutate the iteration; gather overlaps the transport writes instead of
+    # paying each client's send latency in sequence.
+    targets = list(active_connections)
+    results = await asyncio.gather(
+        *(ws.send_bytes(payload_bytes) for ws in targets), return_exceptions=True
+    )
+    disconnected = {ws for ws, res in zip(targets, results) if isinstance(res, Exception)}
     active_connections.difference_update(disconnected)
     logging.info(f"📊 Broadcasted to {len(active_connections)} clients: ${price:,.2f}")
 
@@ -78,10 +90,10 @@ async def price_queue_processor():
     """Background task that processes queued price updates"""
     while True:
         try:
-            if not price_queue.empty():
-                price, volume = price_queue.get_nowait()
-                await broadcast_price_update(price, volume)
-            await asyncio.sleep(0.1)  # Check queue every 100ms
+            price, volume = await price_queue.get()
+            await broadcast_price_update(price, volume)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logging.error(f"Price queue processor error: {e}")
             await asyncio.sleep(1)
@@ -89,11 +101,10 @@ async def price_queue_processor():
 def process_price_update_sync(price: float, volume: float):
     """Thread-safe function called from sync price feed"""
     try:
-        # Put price update in queue - this is thread-safe
-        price_queue.put_nowait((price, volume))
-        logging.info(f"📊 Queued price update: ${price:,.2f}")
-    except queue.Full:
-        logging.warning("Price queue full - skipping update")
+        # Hop onto the main loop; put_nowait runs there, so the asyncio
+        # queue needs no locking and the processor wakes immediately.
+        if main_loop is not None and price_queue is not None:
+            main_loop.call_soon_threadsafe(price_queue.put_nowait, (price, volume))
     except Exception as e:
         logging.error(f"Failed to queue price update: {e}")
 
@@ -113,6 +124,14 @@ class TradeRequest(BaseModel):
     side: str = Field(..., pattern="^(buy|sell)$")
     # premium_per_contract: Optional[float] = None # Only if frontend reliably sends it and backend validates/uses it
 
+    # Normalize once at validation time so the handlers never call
+    # .lower() on these fields again (and uppercase client input still
+    # passes the patterns above, which run after this hook).
+    @field_validator("option_type", "side", mode="before")
+    @classmethod
+    def _lowercase(cls, value):
+        return value.lower() if isinstance(value, str) else value
+
 class UserAccountRequest(BaseModel):
     user_id: str
     initial_btc_balance: float = 0.01
@@ -141,83 +160,280 @@ app = FastAPI(
     title=f"{config.PLATFORM_NAME} API",
     version=config.VERSION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
+class _AppState:
+    """Slotted replacement for Starlette's dict-backed State.
+
+    The request path reads these attributes constantly; fixed slots resolve
+    through a C-level descriptor instead of Starlette's __getattr__ fallback
+    into an instance dict. New state attributes must be added here.
+    """
+    __slots__ = (
+        "ws_manager", "pricing_engine", "data_feed_manager", "price_callback",
+        "hedger", "trade_executor", "sandbox_service", "tick_q",
+        "out_q", "broadcast_drainer_task",
+        "position_updates_task", "market_updates_task",
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+app.state = _AppState()
+
 # --- BULLET-PROOF CORS SETUP ---
 from backend.cors_config import setup_cors
 setup_cors(app)
 logger.info("✅ Bullet-proof CORS middleware configured")
 
-@app.middleware("http")
-async def log_requests_middleware(request: Request, call_next):
-    start_time = time.perf_counter()
-    response = await call_next(request)
-    process_time = time.perf_counter() - start_time
-    if process_time > 0.1: # Log only if request is slower than 100ms
-        logger.warning(f"⚠️ Slow request: {request.method} {request.url.path} took {process_time:.3f}s")
-    return response
+# Paths not worth timing: the health check and the docs UI.
+_SLOWLOG_SKIP_PATHS = frozenset({"/", "/docs", "/redoc", "/openapi.json"})
+
+if config.ENABLE_SLOWLOG:
+    @app.middleware("http")
+    async def log_requests_middleware(request: Request, call_next):
+        if request.url.path in _SLOWLOG_SKIP_PATHS:
+            return await call_next(request)
+        # The loop clock is monotonic and already maintained by the scheduler,
+        # so reading it is cheaper than a fresh perf_counter syscall.
+        loop_time = asyncio.get_event_loop().time
+        start_time = loop_time()
+        response = await call_next(request)
+        process_time = loop_time() - start_time
+        if process_time > 0.1: # Log only if request is slower than 100ms
+            logger.warning(f"⚠️ Slow request: {request.method} {request.url.path} took {process_time:.3f}s")
+        return response
 
 # +++ ADDED: asyncio.Event for startup synchronization +++
 api_startup_complete_event = asyncio.Event()
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+# True only between startup_event starting and finishing. The gate below
+# keys off this instead of the completion event alone so that serving the
+# app without its lifespan (tests do this, injecting components directly
+# into app.state) is not refused.
+_startup_in_progress = False
+
+# Cap on sends fired in one gather before yielding back to the event loop.
+BROADCAST_BATCH_SIZE = 50
+
+# Expiry membership is checked on every trade and chain request; a frozenset
+# makes it a hash probe instead of a list scan.
+_EXPIRIES_SET = frozenset(config.AVAILABLE_EXPIRIES_MINUTES)
+
+# Prebuilt rejections for the sandbox validation path: the detail strings
+# never vary per request, so formatting them (and allocating the exception)
+# on every bad request is wasted work under input flooding. HTTPException
+# carries no per-raise state, so the instances are safely reusable.
+_INVALID_EXPIRY_EXC = HTTPException(
+    status_code=400, detail=f"Invalid expiry. Available: {config.AVAILABLE_EXPIRIES_MINUTES}"
+)
+_INVALID_QUANTITY_EXC = HTTPException(status_code=400, detail="Invalid quantity")
+_INVALID_STRIKE_EXC = HTTPException(status_code=400, detail="Invalid strike price")
+
+# The sandbox symbol is one of two values; interned constants beat an
+# .upper() scan plus f-string allocation per trade.
+_SYMBOL_BY_OPT = {"call": sys.intern("BTC-CALL"), "put": sys.intern("BTC-PUT")}
+
+# Known-user fast path for the trade endpoints: after the first trade a
+# user costs one set lookup. Creation runs under a per-user lock so two
+# concurrent first trades cannot double-initialize the account.
+_KNOWN_USERS: set = set()
+_USER_CREATION_LOCKS: "defaultdict[str, asyncio.Lock]" = defaultdict(asyncio.Lock)
+
+async def _ensure_user_account(trade_executor, user_id: str):
+    if user_id in _KNOWN_USERS:
+        return
+    async with _USER_CREATION_LOCKS[user_id]:
+        if user_id not in trade_executor.user_accounts:
+            trade_executor.create_user_account(user_id)
+        _KNOWN_USERS.add(user_id)
+    _USER_CREATION_LOCKS.pop(user_id, None)
+
+# Sandbox trade ids only need to be unique within a session: a process-start
+# nonce plus a C-level counter gives that without paying uuid4's urandom
+# syscall on every trade.
+_TRADE_ID_NONCE = secrets.token_hex(2)
+_TRADE_ID_SEQ = itertools.count(1)
+
+# Paths that must answer even while components are still coming up — the
+# deploy platform polls the health check during boot.
+_STARTUP_GATE_EXEMPT_PATHS = frozenset({"/", "/docs", "/redoc", "/openapi.json"})
+
+@app.middleware("http")
+async def startup_gate_middleware(request: Request, call_next):
+    if _startup_in_progress and not api_startup_complete_event.is_set() \
+            and request.url.path not in _STARTUP_GATE_EXEMPT_PATHS:
+        # Cheap flat 503 instead of letting every endpoint discover a
+        # half-initialized app.state and raise its own exception.
+        return ORJSONResponse({"detail": "API is starting up"}, status_code=503)
+    return await call_next(request)
+
 # --- WebSocket Manager ---
 class SimpleWebSocketManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.user_connections: Dict[str, WebSocket] = {}
-        self._lock = asyncio.Lock() # For thread-safe modifications if needed, though FastAPI runs in single event loop
+        # Single source of truth keyed by id(ws): each socket is stored once
+        # alongside its (optional) user id, so connect/disconnect/lookup are
+        # all O(1) dict ops with no parallel containers to keep in sync.
+        self.conns: Dict[int, tuple[WebSocket, Optional[str]]] = {}
+        # A user may hold several sockets at once (multiple tabs), so the
+        # index maps user_id -> set of connection ids.
+        self.by_user: Dict[str, set[int]] = {}
+        # No lock: everything runs on the one event loop and the compound
+        # connect/disconnect mutations contain no await, so they are atomic
+        # with respect to other coroutines.
+        # Frames shed because a client's transport stayed backpressured past
+        # the send timeout. Monotonic; exposed for ops visibility.
+        self.dropped_frames = 0
+
+    @staticmethod
+    async def _timed_send(ws_client: WebSocket, payload: bytes):
+        """Send one frame, giving up if the client's transport is stalled.
+
+        A paused transport (slow reader, dead NAT mapping) makes send_bytes
+        await indefinitely, wedging the whole chunk gather behind one peer.
+        The timeout converts that into an error the failure sweep handles.
+        """
+        await asyncio.wait_for(
+            ws_client.send_bytes(payload), timeout=config.WS_SLOW_SEND_TIMEOUT_SECONDS
+        )
 
     async def connect(self, websocket: WebSocket, user_id: Optional[str] = None):
         # CRITICAL FIX: DO NOT accept the connection here.
         # The main endpoint will handle that. This method only tracks the connection.
         # await websocket.accept()  <-- REMOVED THIS LINE
-        
-        async with self._lock:
-            self.active_connections.append(websocket)
-            if user_id: self.user_connections[user_id] = websocket
-        logger.info(f"🔌 WebSocket tracked (Total: {len(self.active_connections)}, Users: {len(self.user_connections)})")
+
+        self.conns[id(websocket)] = (websocket, user_id)
+        if user_id: self.by_user.setdefault(user_id, set()).add(id(websocket))
+        logger.info(f"🔌 WebSocket tracked (Total: {len(self.conns)}, Users: {len(self.by_user)})")
 
     async def disconnect(self, websocket: WebSocket, user_id: Optional[str] = None):
-        async with self._lock:
-            if websocket in self.active_connections: self.active_connections.remove(websocket)
-            if user_id and user_id in self.user_connections and self.user_connections[user_id] == websocket:
-                del self.user_connections[user_id]
-        logger.info(f"🔌 WebSocket disconnected (Total: {len(self.active_connections)}, Users: {len(self.user_connections)})")
+        conn_id = id(websocket)
+        entry = self.conns.pop(conn_id, None)
+        stored_uid = entry[1] if entry else user_id
+        if stored_uid:
+            user_conn_ids = self.by_user.get(stored_uid)
+            if user_conn_ids is not None:
+                user_conn_ids.discard(conn_id)
+                if not user_conn_ids:
+                    del self.by_user[stored_uid]
+        logger.info(f"🔌 WebSocket disconnected (Total: {len(self.conns)}, Users: {len(self.by_user)})")
 
     async def broadcast_safe(self, message: dict, user_id: Optional[str] = None):
-        message_json = json.dumps(message)
-        targets: List[WebSocket] = []
-
-        async with self._lock: # Access shared lists safely
-            if user_id and user_id in self.user_connections:
-                targets.append(self.user_connections[user_id])
-            elif not user_id:
-                targets = self.active_connections.copy()
-
-        if not targets: return
-
-        disconnected_sockets_info: List[tuple[WebSocket, Optional[str]]] = []
-        for ws_client in targets:
-            try:
-                await ws_client.send_text(message_json)
-            except Exception:
-                logger.debug(f"WebSocket send failed to a client. Marking for removal.")
-                # Try to find the user_id associated with this failing ws_client for proper disconnect
-                uid_of_failed_socket = None
-                async with self._lock: # Lock for reading user_connections if needed, though less critical here
-                    for uid, sock in self.user_connections.items():
-                        if sock == ws_client:
-                            uid_of_failed_socket = uid
-                            break
-                disconnected_sockets_info.append((ws_client, uid_of_failed_socket))
-        
-        for ws_client_to_remove, uid_to_remove in disconnected_sockets_info:
-            await self.disconnect(ws_client_to_remove, uid_to_remove)
+        # Encode once to bytes; send_bytes hands the same buffer to every
+        # client's transport instead of re-encoding UTF-8 per send.
+        await self.broadcast_bytes(orjson.dumps(message), user_id)
+
+    async def broadcast_bytes(self, payload: bytes, user_id: Optional[str] = None):
+        """Fan a pre-encoded JSON frame out to clients.
+
+        Hot paths that build frames from byte templates call this directly to
+        skip the dict construction and orjson encode entirely.
+        """
+        await self.broadcast_batch([(user_id, payload)])
+
+    async def broadcast_many(self, msgs: List[tuple[str, bytes]]):
+        """Send a batch of per-user frames in one concurrent fan-out."""
+        await self.broadcast_batch(msgs)
+
+    async def broadcast_batch(self, items: List[tuple[Optional[str], bytes]]):
+        """Fan a mixed batch of frames out in a single gather.
+
+        Each item is (user_id, payload): a user id routes to every socket
+        that user has open, None routes to all connections. Resolving the
+        whole batch in one pass and awaiting one gather means a burst of
+        frames costs one scheduler wakeup instead of one per message.
+        """
+        # Lock-free snapshot: the send list materializes before the first
+        # await, so connects/disconnects during the fan-out cannot mutate it.
+        sends: List[tuple[WebSocket, Optional[str], bytes]] = []
+        for target_uid, payload in items:
+            if target_uid is None:
+                for ws_client, uid in list(self.conns.values()):
+                    sends.append((ws_client, uid, payload))
+            else:
+                for conn_id in list(self.by_user.get(target_uid, ())):
+                    entry = self.conns.get(conn_id)
+                    if entry:
+                        sends.append((entry[0], target_uid, payload))
+
+        if not sends: return
+
+        # Fan out concurrently: serial awaits made total wall time the sum of
+        # per-client send latencies, so one slow peer stalled everyone behind
+        # it. Large fan-outs are chunked with a sleep(0) between gathers so
+        # other handlers get the loop back instead of stalling behind one
+        # monolithic send burst. Each send is individually bounded by
+        # _timed_send so a backpressured client caps the chunk at the
+        # timeout instead of wedging it indefinitely.
+        for i in range(0, len(sends), BROADCAST_BATCH_SIZE):
+            chunk = sends[i:i + BROADCAST_BATCH_SIZE]
+            results = await asyncio.gather(
+                *(self._timed_send(ws_client, payload) for ws_client, _uid, payload in chunk),
+                return_exceptions=True
+            )
+            for (ws_client, uid, _payload), send_result in zip(chunk, results):
+                if isinstance(send_result, asyncio.TimeoutError):
+                    # Cancelling a send mid-frame leaves the websocket's
+                    # framing state undefined, so a shed client must also be
+                    # dropped — it would corrupt on the next frame anyway.
+                    self.dropped_frames += 1
+                    logger.info("WebSocket send timed out (slow client). Dropping connection "
+                                f"(dropped_frames={self.dropped_frames}).")
+                    await self.disconnect(ws_client, uid)
+                elif isinstance(send_result, Exception):
+                    logger.debug("WebSocket send failed to a client. Marking for removal.")
+                    await self.disconnect(ws_client, uid)
+            if i + BROADCAST_BATCH_SIZE < len(sends):
+                await asyncio.sleep(0)
 
 ws_manager_global_instance = SimpleWebSocketManager() # Global instance of the manager for app.state
 
+async def _queued_broadcast(app_instance: FastAPI, message: dict, user_id: Optional[str] = None):
+    """Route a broadcast through the shared outbound queue when it exists.
+
+    Endpoints schedule this from background_tasks; the drainer coalesces
+    whatever has accumulated into one batched fan-out. Without the queue
+    (app served without its lifespan) it degrades to a direct broadcast.
+    """
+    out_q = getattr(app_instance.state, 'out_q', None)
+    payload = orjson.dumps(message)
+    if out_q is not None:
+        out_q.put_nowait((user_id, payload))
+        return
+    ws_manager = getattr(app_instance.state, 'ws_manager', None)
+    if ws_manager:
+        await ws_manager.broadcast_bytes(payload, user_id)
+
+# Singletons bound once at the end of startup_event. These are set exactly
+# once and never swapped, so hot endpoints read a module global instead of
+# walking request.app.state per call. They stay None until startup has run;
+# callers fall back to app.state for that window (tests inject components
+# there directly), and the existing 503 guards cover the uninitialized case.
+PRICING_ENGINE = None
+TRADE_EXECUTOR = None
+WS_MANAGER = None
+DATA_FEED = None
+SANDBOX = None
+
+# Pre-encoded frame templates for the hottest, fixed-shape messages: only
+# the floats change per tick, so splicing them into a bytes template skips
+# dict construction and the JSON encoder on every send.
+_MARKET_UPDATE_TMPL = b'{"type":"market_update","data":{"price":%.2f,"timestamp":%.6f}}'
+_PONG_TMPL = b'{"type":"pong","timestamp":%.6f}'
+
+def _put_latest_tick(tick_q: "asyncio.Queue", price: float):
+    """Drop-and-replace put for the one-slot tick queue (runs on the loop)."""
+    if tick_q.full():
+        try:
+            tick_q.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+    tick_q.put_nowait(price)
+
 # --- Price Update Handling Factory ---
 def _handle_price_update_sync_factory(app_instance: FastAPI):
     # This function needs to be a closure to capture app_instance
@@ -238,6 +454,13 @@ def _handle_price_update_sync_factory(app_instance: FastAPI):
                     # Use thread-safe queue instead of problematic async call
                     process_price_update_sync(price_val, volume_val)
                     # --- END THREAD-SAFE EVENT LOOP FIX ---
+
+                    # Wake the market-update broadcaster immediately. The
+                    # one-slot queue coalesces bursts: only the newest price
+                    # survives, so a slow consumer never builds a backlog.
+                    tick_q = getattr(app_instance.state, 'tick_q', None)
+                    if tick_q is not None and main_loop is not None:
+                        main_loop.call_soon_threadsafe(_put_latest_tick, tick_q, price_val)
                 else:
                     logger.warning(f"Invalid price value received: {price_val}")
                         
@@ -275,6 +498,8 @@ STOCK_PROMPTS = {
 async def startup_event():
     """Initialize components when the application starts up."""
     logger.info("Starting up API components...")
+    global _startup_in_progress
+    _startup_in_progress = True
     try:
         # Initialize WebSocket manager
         app.state.ws_manager = SimpleWebSocketManager()
@@ -287,9 +512,25 @@ async def startup_event():
         )
         logger.info("✅ Pricing engine initialized.")
 
-        # Initialize data feed manager
+        # Warm the vectorized Black-Scholes kernel so the first real chain
+        # request doesn't pay NumPy/scipy one-time setup (ufunc loop
+        # resolution, internal buffer allocation) on the request path.
+        import numpy as _np
+        _warm_strikes = _np.array([95.0, 100.0, 105.0], dtype=_np.float32)
+        _warm_sigmas = _np.full(3, 0.8, dtype=_np.float32)
+        for _side in ("call", "put"):
+            app.state.pricing_engine.black_scholes_batch(
+                100.0, _warm_strikes, 0.01, config.RISK_FREE_RATE, _warm_sigmas, _side
+            )
+        logger.info("✅ Pricing kernel warmed.")
+
+        # Initialize data feed manager. Build the price callback once and
+        # keep it on app.state: endpoints read .latest_price off the same
+        # instance that is actually registered with the feed, instead of
+        # allocating a fresh (never-called) closure per request.
         app.state.data_feed_manager = DataFeedManager()
-        app.state.data_feed_manager.add_price_callback(_handle_price_update_sync_factory(app))
+        app.state.price_callback = _handle_price_update_sync_factory(app)
+        app.state.data_feed_manager.add_price_callback(app.state.price_callback)
         app.state.data_feed_manager.start()
         logger.info("✅ Data feed manager started.")
 
@@ -315,18 +556,41 @@ async def startup_event():
 
         # Start background tasks
         loop = asyncio.get_running_loop()
+        # Eager tasks (Py 3.12+) run their first step synchronously, so sends
+        # that are immediately write-ready skip a full scheduler round trip.
+        if hasattr(asyncio, "eager_task_factory"):
+            loop.set_task_factory(asyncio.eager_task_factory)
+        # One-slot coalescing queue bridging the feed thread to the
+        # market-update broadcaster: the callback drops-and-replaces, the
+        # broadcaster awaits, so ticks arrive event-driven instead of polled.
+        app.state.tick_q = asyncio.Queue(maxsize=1)
+
+        # Shared outbound broadcast queue drained by a single coroutine so
+        # concurrent producers collapse into batched fan-outs.
+        app.state.out_q = asyncio.Queue()
+        app.state.broadcast_drainer_task = loop.create_task(broadcast_drainer(app))
+
         app.state.position_updates_task = loop.create_task(background_position_updates(app))
         app.state.market_updates_task = loop.create_task(background_market_updates(app))
         
         # --- THREAD-SAFE EVENT LOOP FIX ---
-        global main_loop
+        global main_loop, price_queue
         main_loop = loop
+        price_queue = asyncio.Queue()
         asyncio.create_task(price_queue_processor())
         logger.info("🚀 Price queue processor started")
         # --- END THREAD-SAFE EVENT LOOP FIX ---
         
         logger.info("✅ Background tasks started.")
 
+        # Bind the singletons into module globals for the hot request paths.
+        global PRICING_ENGINE, TRADE_EXECUTOR, WS_MANAGER, DATA_FEED, SANDBOX
+        PRICING_ENGINE = app.state.pricing_engine
+        TRADE_EXECUTOR = app.state.trade_executor
+        WS_MANAGER = app.state.ws_manager
+        DATA_FEED = app.state.data_feed_manager
+        SANDBOX = getattr(app.state, 'sandbox_service', None)
+
         # Set the startup complete event
         api_startup_complete_event.set()
         logger.info("✅ API startup complete event set.")
@@ -338,26 +602,99 @@ async def startup_event():
         raise RuntimeError(f"API Startup failed: {e}")
 
 # --- Background Tasks ---
+# How long the drainer lingers after the first queued frame to let a burst
+# accumulate before flushing. Bounded added latency, far fewer frames under
+# trade bursts.
+_BROADCAST_COALESCE_SECONDS = 0.005
+
+def _coalesce_frames(batch: List[tuple[Optional[str], bytes]]) -> List[tuple[Optional[str], bytes]]:
+    """Merge frames sharing a target into one {"type":"multi"} frame.
+
+    Payloads are already-encoded JSON objects, so merging is a byte splice —
+    no re-parse, no re-encode. Targets with a single frame pass through
+    untouched, so clients only ever see the multi wrapper under bursts.
+    """
+    by_target: Dict[Optional[str], List[bytes]] = {}
+    order: List[Optional[str]] = []
+    for target_uid, payload in batch:
+        if target_uid not in by_target:
+            by_target[target_uid] = []
+            order.append(target_uid)
+        by_target[target_uid].append(payload)
+
+    merged: List[tuple[Optional[str], bytes]] = []
+    for target_uid in order:
+        payloads = by_target[target_uid]
+        if len(payloads) == 1:
+            merged.append((target_uid, payloads[0]))
+        else:
+            merged.append((target_uid, b'{"type":"multi","items":[' + b','.join(payloads) + b']}'))
+    return merged
+
+async def broadcast_drainer(app_instance: FastAPI):
+    """Drain the shared outbound queue into batched WebSocket fan-outs.
+
+    All broadcast producers enqueue (user_id_or_None, payload_bytes); this
+    single consumer lingers a few milliseconds after the first frame so a
+    burst coalesces, merges same-target frames into one multi frame, and
+    hands the batch to the manager for one gather — bursty producers cost
+    one wakeup and one frame per client per drain instead of one each.
+    """
+    logger.info("Broadcast drainer task started.")
+    out_q: asyncio.Queue = app_instance.state.out_q
+    while True:
+        try:
+            batch = [await out_q.get()]
+            await asyncio.sleep(_BROADCAST_COALESCE_SECONDS)
+            while len(batch) < 64:
+                try:
+                    batch.append(out_q.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            ws_manager = getattr(app_instance.state, 'ws_manager', None)
+            if ws_manager:
+                await ws_manager.broadcast_batch(_coalesce_frames(batch))
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"Error in broadcast drainer: {e}", exc_info=True)
+
 async def background_position_updates(app_instance: FastAPI):
     """Background task to update position data and broadcast to WebSocket clients."""
     logger.info("Background position updates task started.")
+    last_sent_frames: Dict[str, bytes] = {}  # user_id -> last payload, to skip unchanged portfolios
     while True:
         try:
             await asyncio.sleep(5.0)  # Update every 5 seconds
             trade_executor = getattr(app_instance.state, 'trade_executor', None)
-            if not trade_executor:
+            ws_manager = getattr(app_instance.state, 'ws_manager', None)
+            if not trade_executor or not ws_manager:
                 continue
 
+            # Encode all frames first, dropping users whose portfolio hasn't
+            # changed since the last tick, then fan the batch out in one call
+            # instead of a broadcast round-trip per user.
+            batch: List[tuple[str, bytes]] = []
             for user_id, account in trade_executor.user_accounts.items():
-                ws_manager = getattr(app_instance.state, 'ws_manager', None)
-                if ws_manager:
-                    await ws_manager.broadcast_safe({
-                        "type": "position_update",
-                        "data": {
-                            "user_id": user_id,
-                            "portfolio": account.get_portfolio_summary()
-                        }
-                    }, user_id=user_id)
+                payload = orjson.dumps({
+                    "type": "position_update",
+                    "data": {
+                        "user_id": user_id,
+                        "portfolio": account.get_portfolio_summary()
+                    }
+                })
+                if last_sent_frames.get(user_id) == payload:
+                    continue
+                last_sent_frames[user_id] = payload
+                batch.append((user_id, payload))
+
+            if batch:
+                out_q = getattr(app_instance.state, 'out_q', None)
+                if out_q is not None:
+                    for item in batch:
+                        out_q.put_nowait(item)
+                else:
+                    await ws_manager.broadcast_many(batch)
         except asyncio.CancelledError:
             break
         except Exception as e:
@@ -367,34 +704,62 @@ async def background_market_updates(app_instance: FastAPI):
     """Background task to update market data and broadcast to WebSocket clients."""
     logger.info("🚀 Background market updates task started.")
     update_count = 0
+    last_broadcast_price = 0.0
+    last_broadcast_ts = 0.0
+    delta_threshold = config.PRICE_CHANGE_THRESHOLD_FOR_BROADCAST
+    heartbeat_seconds = config.PRICE_BROADCAST_HEARTBEAT_SECONDS
+    tick_q = getattr(app_instance.state, 'tick_q', None)
     while True:
         try:
-            await asyncio.sleep(1.0) # Broadcasting every second
+            # Event-driven: block on the one-slot tick queue and wake the
+            # moment the feed publishes. The timeout doubles as the heartbeat
+            # clock so a quiet feed still produces periodic frames.
+            current_price = 0.0
+            if tick_q is not None:
+                try:
+                    current_price = await asyncio.wait_for(tick_q.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(heartbeat_seconds)
             data_feed_manager = getattr(app_instance.state, 'data_feed_manager', None)
-            
+
             # This check is critical - if the data feed stops, so do updates
             if not data_feed_manager or not data_feed_manager.is_running:
                 logger.warning("⚠️ Data feed manager not available or not running")
+                await asyncio.sleep(0.9)
                 continue
 
-            current_price = data_feed_manager.get_current_price()
+            if not current_price:
+                # Heartbeat path: no fresh tick arrived within the window.
+                current_price = data_feed_manager.get_current_price()
             if current_price and current_price > 0:
                 ws_manager = getattr(app_instance.state, 'ws_manager', None)
                 if ws_manager:
+                    now = time.time()
+                    if last_broadcast_price > 0:
+                        price_delta = abs(current_price - last_broadcast_price) / last_broadcast_price
+                        # Skip unchanged prices, but always heartbeat so clients
+                        # can tell a quiet feed from a dead one.
+                        if price_delta < delta_threshold and (now - last_broadcast_ts) < heartbeat_seconds:
+                            continue
                     # This broadcast sends the ongoing updates
                     update_count += 1
-                    await ws_manager.broadcast_safe({
-                        "type": "market_update",
-                        "data": {
-                            "price": current_price,
-                            "timestamp": time.time()
-                        }
-                    })
-                    logger.info(f"📊 Market update #{update_count}: ${current_price:,.2f} broadcasted to {len(ws_manager.active_connections)} clients")
+                    frame = _MARKET_UPDATE_TMPL % (current_price, now)
+                    out_q = getattr(app_instance.state, 'out_q', None)
+                    if out_q is not None:
+                        out_q.put_nowait((None, frame))
+                    else:
+                        await ws_manager.broadcast_bytes(frame)
+                    last_broadcast_price = current_price
+                    last_broadcast_ts = now
+                    logger.info(f"📊 Market update #{update_count}: ${current_price:,.2f} broadcasted to {len(ws_manager.conns)} clients")
                 else:
                     logger.warning("⚠️ WebSocket manager not available")
+                    await asyncio.sleep(0.9)
             else:
                 logger.warning(f"⚠️ Invalid price received: {current_price}")
+                await asyncio.sleep(0.9)
 
         except asyncio.CancelledError:
             logger.info("🛑 Background market updates task cancelled")
@@ -412,7 +777,7 @@ async def health_check_endpoint(request: Request):
 async def calculate_black_scholes_basic_endpoint(request_data: BlackScholesRequest, request: Request):
     """Calculate basic Black-Scholes option price."""
     try:
-        pricing_engine = getattr(request.app.state, 'pricing_engine', None)
+        pricing_engine = PRICING_ENGINE or getattr(request.app.state, 'pricing_engine', None)
         if not pricing_engine:
             raise HTTPException(status_code=503, detail="Pricing engine not available.")
         price = pricing_engine.calculate_option_price(
@@ -430,9 +795,9 @@ async def calculate_black_scholes_basic_endpoint(request_data: BlackScholesReque
 
 @app.get("/market/price")
 async def get_current_market_price_endpoint(request: Request):
-    local_data_feed_manager = getattr(request.app.state, 'data_feed_manager', None)
-    local_pricing_engine = getattr(request.app.state, 'pricing_engine', None)
-    price_update_callback_ref = _handle_price_update_sync_factory(request.app)
+    local_data_feed_manager = DATA_FEED or getattr(request.app.state, 'data_feed_manager', None)
+    local_pricing_engine = PRICING_ENGINE or getattr(request.app.state, 'pricing_engine', None)
+    price_update_callback_ref = getattr(request.app.state, 'price_callback', None)
 
     if not local_data_feed_manager or not local_data_feed_manager.is_running:
         raise HTTPException(status_code=503, detail="Data feed unavailable or not currently running.")
@@ -446,7 +811,7 @@ async def get_current_market_price_endpoint(request: Request):
 
 @app.get("/market/option-chains")
 async def get_option_chains_endpoint(request: Request, expiry_minutes: Optional[int] = None):
-    local_pricing_engine = getattr(request.app.state, 'pricing_engine', None)
+    local_pricing_engine = PRICING_ENGINE or getattr(request.app.state, 'pricing_engine', None)
     if not local_pricing_engine:
         raise HTTPException(status_code=503, detail="Pricing engine not available.")
     if not (local_pricing_engine.current_price and local_pricing_engine.current_price > 0):
@@ -456,23 +821,27 @@ async def get_option_chains_endpoint(request: Request, expiry_minutes: Optional[
             logger.error("Market price still not available for pricing engine after wait. Cannot generate chains.")
             raise HTTPException(status_code=503, detail="Market price not yet available for pricing engine.")
     try:
+        # Returning a Response directly bypasses FastAPI's jsonable_encoder
+        # pass: the chains are already plain dicts of floats and strings (and
+        # memoized on the chain objects), so the only serialization work left
+        # is the single orjson encode inside ORJSONResponse.
         if expiry_minutes:
-            if expiry_minutes not in config.AVAILABLE_EXPIRIES_MINUTES:
+            if expiry_minutes not in _EXPIRIES_SET:
                 raise HTTPException(status_code=400, detail=f"Invalid expiry. Available: {config.AVAILABLE_EXPIRIES_MINUTES}")
             chain_result = local_pricing_engine.generate_option_chain(expiry_minutes)
-            return {"chains": {str(expiry_minutes): chain_result.dict() if chain_result else {}}}
+            return ORJSONResponse({"chains": {str(expiry_minutes): chain_result.dict() if chain_result else {}}})
         else:
             all_chains_result = local_pricing_engine.generate_all_chains()
-            return {"chains": {str(key): val.dict() if val else {} for key, val in all_chains_result.items()}}
+            return ORJSONResponse({"chains": {str(key): val.dict() if val else {} for key, val in all_chains_result.items()}})
     except Exception as e_chains:
         logger.error(f"❌ Error generating option chains: {e_chains}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating option chains: {str(e_chains)}")
 
 @app.post("/trades/execute")
 async def execute_trade_endpoint(trade_request: TradeRequest, request_obj: Request, background_tasks: BackgroundTasks): # Changed param names
-    local_trade_executor = getattr(request_obj.app.state, 'trade_executor', None)
-    local_pricing_engine = getattr(request_obj.app.state, 'pricing_engine', None)
-    local_ws_manager = getattr(request_obj.app.state, 'ws_manager', None)
+    local_trade_executor = TRADE_EXECUTOR or getattr(request_obj.app.state, 'trade_executor', None)
+    local_pricing_engine = PRICING_ENGINE or getattr(request_obj.app.state, 'pricing_engine', None)
+    local_ws_manager = WS_MANAGER or getattr(request_obj.app.state, 'ws_manager', None)
 
     if not (local_trade_executor and local_pricing_engine and local_pricing_engine.current_price and local_pricing_engine.current_price > 0):
         raise HTTPException(status_code=503, detail="System not ready for trading or market price unavailable.")
@@ -481,8 +850,13 @@ async def execute_trade_endpoint(trade_request: TradeRequest, request_obj: Reque
         if not option_chain_data:
             raise HTTPException(status_code=400, detail=f"No option chain available for expiry {trade_request.expiry_minutes} min.")
         
-        quotes_list = option_chain_data.calls if trade_request.option_type.lower() == "call" else option_chain_data.puts
-        matching_quote = next((q for q in quotes_list if math.isclose(q.strike, trade_request.strike)), None)
+        # The engine serves this chain from its short-TTL cache, and the chain
+        # carries an integer-cent strike index, so the lookup is O(1) instead
+        # of a linear math.isclose scan per trade.
+        is_call_request = trade_request.option_type == "call"
+        quotes_list = option_chain_data.calls if is_call_request else option_chain_data.puts
+        strike_index = option_chain_data.calls_by_strike if is_call_request else option_chain_data.puts_by_strike
+        matching_quote = strike_index.get(int(round(trade_request.strike * 100)))
 
         if not matching_quote:
             available_strikes = [q.strike for q in quotes_list]
@@ -492,7 +866,7 @@ async def execute_trade_endpoint(trade_request: TradeRequest, request_obj: Reque
         greeks_for_order = matching_quote.greeks if isinstance(matching_quote.greeks, dict) else {}
         order_details = TradeOrder(
             order_id=f"ord_{int(time.time()*1000)}_{trade_request.user_id[-4:] if len(trade_request.user_id)>=4 else trade_request.user_id}",
-            user_id=trade_request.user_id, symbol=matching_quote.symbol, side=OrderSide(trade_request.side.lower()),
+            user_id=trade_request.user_id, symbol=matching_quote.symbol, side=OrderSide(trade_request.side),
             quantity=trade_request.quantity, premium_per_contract=matching_quote.premium_usd,
             total_premium=(matching_quote.premium_usd * trade_request.quantity), option_type=trade_request.option_type,
             strike=trade_request.strike, expiry_minutes=trade_request.expiry_minutes, timestamp=time.time(),
@@ -503,8 +877,11 @@ async def execute_trade_endpoint(trade_request: TradeRequest, request_obj: Reque
         if not success_flag:
             raise HTTPException(status_code=400, detail=message_str)
         
-        if local_ws_manager:
-            background_tasks.add_task(local_ws_manager.broadcast_safe, {
+        # Skip the task scheduling entirely when the trading user has no
+        # socket open — the frame is user-targeted and would fan out to
+        # nobody.
+        if local_ws_manager and trade_request.user_id in local_ws_manager.by_user:
+            background_tasks.add_task(_queued_broadcast, request_obj.app, {
                 "type":"trade_executed",
                 "data":{"order_id":order_details.order_id, "symbol":order_details.symbol,
                         "premium":order_details.total_premium,
@@ -524,7 +901,7 @@ async def execute_trade_endpoint(trade_request: TradeRequest, request_obj: Reque
 
 @app.post("/users/create")
 async def create_user_endpoint(user_request: UserAccountRequest, request_obj: Request) -> UserAccount: # Changed param names
-    local_trade_executor = getattr(request_obj.app.state, 'trade_executor', None)
+    local_trade_executor = TRADE_EXECUTOR or getattr(request_obj.app.state, 'trade_executor', None)
     if not local_trade_executor: raise HTTPException(status_code=503, detail="Trade executor not available")
     try:
         if user_request.user_id in local_trade_executor.user_accounts:
@@ -536,7 +913,7 @@ async def create_user_endpoint(user_request: UserAccountRequest, request_obj: Re
 
 @app.get("/users/{user_id}/portfolio")
 async def get_portfolio_endpoint(user_id: str, request: Request):
-    local_trade_executor = getattr(request.app.state, 'trade_executor', None)
+    local_trade_executor = TRADE_EXECUTOR or getattr(request.app.state, 'trade_executor', None)
     if not local_trade_executor: raise HTTPException(status_code=503, detail="Trade executor not available")
     portfolio_data = local_trade_executor.get_user_portfolio_summary(user_id) 
     if not portfolio_data: raise HTTPException(status_code=404, detail=f"User {user_id} not found or no portfolio.")
@@ -544,14 +921,14 @@ async def get_portfolio_endpoint(user_id: str, request: Request):
 
 @app.post("/positions/close")
 async def close_position_endpoint(close_request: ClosePositionRequest, request_obj: Request, background_tasks: BackgroundTasks): # Changed param names
-    local_trade_executor = getattr(request_obj.app.state, 'trade_executor', None)
-    local_ws_manager = getattr(request_obj.app.state, 'ws_manager', None)
+    local_trade_executor = TRADE_EXECUTOR or getattr(request_obj.app.state, 'trade_executor', None)
+    local_ws_manager = WS_MANAGER or getattr(request_obj.app.state, 'ws_manager', None)
     if not local_trade_executor: raise HTTPException(status_code=503, detail="Trade executor not available")
     try:
         success_flag, message_str = local_trade_executor.close_position(close_request.user_id, close_request.position_id, close_request.partial_quantity)
         if not success_flag: raise HTTPException(status_code=400, detail=message_str)
-        if local_ws_manager:
-            background_tasks.add_task(local_ws_manager.broadcast_safe, {"type":"position_closed", "data":{"position_id":close_request.position_id, "message":message_str}}, user_id=close_request.user_id)
+        if local_ws_manager and close_request.user_id in local_ws_manager.by_user:
+            background_tasks.add_task(_queued_broadcast, request_obj.app, {"type":"position_closed", "data":{"position_id":close_request.position_id, "message":message_str}}, user_id=close_request.user_id)
         return {"success":True, "message":message_str}
     except HTTPException: raise
     except Exception as e: logger.error(f"Position close error: {e}", exc_info=True); raise HTTPException(status_code=500, detail=f"Position close failed: {str(e)}")
@@ -559,8 +936,8 @@ async def close_position_endpoint(close_request: ClosePositionRequest, request_o
 # +++ DEFINITIVE WebSocket endpoint with defensive send operations +++
 @app.websocket("/ws")
 async def websocket_connection_endpoint(websocket: WebSocket, user_id: Optional[str] = None):
-    local_ws_manager = getattr(websocket.app.state, 'ws_manager', None)
-    local_pricing_engine = getattr(websocket.app.state, 'pricing_engine', None)
+    local_ws_manager = WS_MANAGER or getattr(websocket.app.state, 'ws_manager', None)
+    local_pricing_engine = PRICING_ENGINE or getattr(websocket.app.state, 'pricing_engine', None)
 
     if not local_ws_manager:
         logger.error("WebSocket connection failed: ws_manager not found.")
@@ -578,39 +955,41 @@ async def websocket_connection_endpoint(websocket: WebSocket, user_id: Optional[
         if local_pricing_engine and hasattr(local_pricing_engine, 'current_price') and local_pricing_engine.current_price > 0:
             initial_price = local_pricing_engine.current_price
             
-        await websocket.send_text(json.dumps({
+        await websocket.send_bytes(orjson.dumps({
             "type": "connected",
             "data": {"current_price": initial_price}
         }))
         logger.info(f"Sent 'connected' message with initial price ${initial_price} to client.")
 
-        # Main loop for receiving messages and sending keep-alives
+        # Main loop for receiving messages. Idle-connection keepalives come
+        # from protocol-level pings (ws_ping_interval/ws_ping_timeout in the
+        # uvicorn config), so there is no per-message wait_for timer to arm
+        # and cancel — a bare receive awaits until the client actually sends.
         while True:
             try:
-                # Wait for a message from the client with a timeout
-                data_received = await asyncio.wait_for(websocket.receive_text(), timeout=config.WEBSOCKET_TIMEOUT_SECONDS)
-                message_obj = json.loads(data_received)
+                data_received = await websocket.receive_text()
+
+                # Ping fast-path: clients serialize with the type field first,
+                # so a prefix check answers the dominant message without
+                # parsing it. (receive_text is kept — Starlette's
+                # receive_bytes errors on text frames, which is all the
+                # browsers send — so the check is on the str prefix.)
+                if data_received.startswith('{"type":"ping"'):
+                    await websocket.send_bytes(_PONG_TMPL % time.time())
+                    continue
+
+                message_obj = orjson.loads(data_received)
 
                 # Process 'join' message as a one-way notification. DO NOT reply.
                 if message_obj.get("type") == "join":
                     logger.info(f"Client sent 'join' message: {message_obj.get('data')}. No ack needed.")
                     pass # Simply continue the loop
 
-            except asyncio.TimeoutError:
-                # If the client has been silent, the SERVER sends a keep-alive message.
-                # This prevents Render's network from closing the idle connection [2, 5].
-                try:
-                    await websocket.send_text(json.dumps({"type": "keepalive", "timestamp": time.time()}))
-                    logger.info("Sent keepalive message to idle client.")
-                except websockets.exceptions.ConnectionClosed:
-                    logger.warning("Could not send 'keepalive'; client disconnected. Breaking loop.")
-                    break
-            
             except (WebSocketDisconnect, websockets.exceptions.ConnectionClosed):
                 logger.info("Client has disconnected.")
                 break
 
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.warning("Received invalid JSON from WebSocket client.")
                 continue
 
@@ -623,45 +1002,63 @@ async def websocket_connection_endpoint(websocket: WebSocket, user_id: Optional[
         logger.info("WebSocket connection cleanup complete.")
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+# Serializes writers of sandbox/config/synthetic_accounts.json so concurrent
+# updates cannot interleave the read-modify-write cycle into a torn file.
+_accounts_file_lock = asyncio.Lock()
+
+_SYNTHETIC_ACCOUNTS_PATH = 'sandbox/config/synthetic_accounts.json'
+
+def _persist_synthetic_account(account_update: SyntheticAccountUpdate) -> None:
+    """Blocking read-modify-write of the synthetic accounts file.
+
+    Runs in a worker thread so the event loop is not stalled on disk I/O.
+    """
+    # Ensure the directory exists
+    os.makedirs('sandbox/config', exist_ok=True)
+
+    # Initialize file if it doesn't exist
+    if not os.path.exists(_SYNTHETIC_ACCOUNTS_PATH):
+        with open(_SYNTHETIC_ACCOUNTS_PATH, 'w') as f:
+            json.dump({"accounts": []}, f, indent=2)
+
+    # Load current accounts
+    with open(_SYNTHETIC_ACCOUNTS_PATH, 'r') as f:
+        data = json.load(f)
+
+    # Update the account
+    account_updated = False
+    for acc in data['accounts']:
+        if acc['account_id'] == account_update.account_id:
+            acc['platform'] = account_update.platform
+            acc['positions'] = account_update.positions
+            account_updated = True
+            break
+
+    if not account_updated:
+        # If account not found, add it
+        data['accounts'].append(account_update.dict())
+
+    # Save updated accounts
+    with open(_SYNTHETIC_ACCOUNTS_PATH, 'w') as f:
+        json.dump(data, f, indent=2)
+
 # New endpoint to update synthetic account information
 @app.post("/sandbox/update-account")
 async def update_synthetic_account_endpoint(account_update: SyntheticAccountUpdate):
     """Update synthetic account information."""
     try:
-        # Ensure the directory exists
-        os.makedirs('sandbox/config', exist_ok=True)
-        
-        # Initialize file if it doesn't exist
-        if not os.path.exists('sandbox/config/synthetic_accounts.json'):
-            with open('sandbox/config/synthetic_accounts.json', 'w') as f:
-                json.dump({"accounts": []}, f, indent=2)
-        
-        # Load current accounts
-        with open('sandbox/config/synthetic_accounts.json', 'r') as f:
-            data = json.load(f)
-        
-        # Update the account
-        account_updated = False
-        for acc in data['accounts']:
-            if acc['account_id'] == account_update.account_id:
-                acc['platform'] = account_update.platform
-                acc['positions'] = account_update.positions
-                account_updated = True
-                break
-        
-        if not account_updated:
-            # If account not found, add it
-            data['accounts'].append(account_update.dict())
-        
-        # Save updated accounts
-        with open('sandbox/config/synthetic_accounts.json', 'w') as f:
-            json.dump(data, f, indent=2)
-        
-        # Update the sandbox service if it exists
-        sandbox_service = getattr(app.state, 'sandbox_service', None)
-        if sandbox_service and hasattr(sandbox_service, 'position_manager'):
-            sandbox_service.position_manager.load_accounts('sandbox/config/synthetic_accounts.json')
-        
+        # Disk work happens off the event loop; the lock keeps concurrent
+        # updates from tearing the shared file.
+        async with _accounts_file_lock:
+            await run_in_threadpool(_persist_synthetic_account, account_update)
+
+            # Update the sandbox service if it exists
+            sandbox_service = getattr(app.state, 'sandbox_service', None)
+            if sandbox_service and hasattr(sandbox_service, 'position_manager'):
+                await run_in_threadpool(
+                    sandbox_service.position_manager.load_accounts, _SYNTHETIC_ACCOUNTS_PATH
+                )
+
         return {"success": True, "message": f"Account {account_update.account_id} updated successfully."}
     except Exception as e:
         logger.error(f"Error updating synthetic account: {e}", exc_info=True)
@@ -675,7 +1072,7 @@ async def execute_sandbox_trade_endpoint(trade_request: TradeRequest, request_ob
         local_ws_manager = getattr(request_obj.app.state, 'ws_manager', None)
         local_pricing_engine = getattr(request_obj.app.state, 'pricing_engine', None)
         local_data_feed_manager = getattr(request_obj.app.state, 'data_feed_manager', None)
-        local_trade_executor = getattr(request_obj.app.state, 'trade_executor', None)
+        local_trade_executor = TRADE_EXECUTOR or getattr(request_obj.app.state, 'trade_executor', None)
 
         # Validate service availability
         if not local_sandbox_service:
@@ -695,27 +1092,27 @@ async def execute_sandbox_trade_endpoint(trade_request: TradeRequest, request_ob
 
         # Validate trade request
         if trade_request.quantity <= 0:
-            raise HTTPException(status_code=400, detail="Invalid quantity")
+            raise _INVALID_QUANTITY_EXC
         if trade_request.strike <= 0:
-            raise HTTPException(status_code=400, detail="Invalid strike price")
-        if trade_request.expiry_minutes not in config.AVAILABLE_EXPIRIES_MINUTES:
-            raise HTTPException(status_code=400, detail=f"Invalid expiry. Available: {config.AVAILABLE_EXPIRIES_MINUTES}")
+            raise _INVALID_STRIKE_EXC
+        if trade_request.expiry_minutes not in _EXPIRIES_SET:
+            raise _INVALID_EXPIRY_EXC
 
         # Create user account if it doesn't exist
-        if trade_request.user_id not in local_trade_executor.user_accounts:
-            local_trade_executor.create_user_account(trade_request.user_id)
-
-        # Convert trade request to sandbox format
-        sandbox_trade_data = {
-            "user_id": trade_request.user_id,
-            "symbol": f"BTC-{trade_request.option_type.upper()}",
-            "quantity": trade_request.quantity,
-            "side": trade_request.side.lower(),
-            "strike": trade_request.strike,
-            "expiry_minutes": trade_request.expiry_minutes,
-            "option_type": trade_request.option_type.lower(),
-            "current_price": current_price
-        }
+        await _ensure_user_account(local_trade_executor, trade_request.user_id)
+
+        # Convert trade request to sandbox format. The field validators on
+        # TradeRequest already normalized option_type and side to lowercase.
+        sandbox_trade_data = SandboxTradeData(
+            user_id=trade_request.user_id,
+            symbol=_SYMBOL_BY_OPT[trade_request.option_type],
+            quantity=trade_request.quantity,
+            side=trade_request.side,
+            strike=trade_request.strike,
+            expiry_minutes=trade_request.expiry_minutes,
+            option_type=trade_request.option_type,
+            current_price=current_price
+        )
 
         # Execute trade in sandbox
         success, message, result = await local_sandbox_service.execute_sandbox_trade(sandbox_trade_data)
@@ -724,15 +1121,16 @@ async def execute_sandbox_trade_endpoint(trade_request: TradeRequest, request_ob
             logger.error(f"Sandbox trade execution failed: {message}")
             raise HTTPException(status_code=400, detail=message)
 
-        # Notify connected clients if websocket manager is available
-        if local_ws_manager:
+        # Notify connected clients if the trading user has a socket open
+        if local_ws_manager and trade_request.user_id in local_ws_manager.by_user:
             background_tasks.add_task(
-                local_ws_manager.broadcast_safe,
+                _queued_broadcast,
+                request_obj.app,
                 {
                     "type": "sandbox_trade_executed",
                     "data": {
                         "user_id": trade_request.user_id,
-                        "symbol": sandbox_trade_data["symbol"],
+                        "symbol": sandbox_trade_data.symbol,
                         "quantity": trade_request.quantity,
                         "side": trade_request.side,
                         "strike": trade_request.strike,
@@ -744,7 +1142,7 @@ async def execute_sandbox_trade_endpoint(trade_request: TradeRequest, request_ob
 
         return {
             "status": "success",
-            "trade_id": f"sandbox_{uuid.uuid4().hex[:8]}",
+            "trade_id": f"sandbox_{_TRADE_ID_NONCE}{next(_TRADE_ID_SEQ):06x}",
             "result": result
         }
 
@@ -754,41 +1152,61 @@ async def execute_sandbox_trade_endpoint(trade_request: TradeRequest, request_ob
         logger.error(f"Unexpected error in sandbox trade execution: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+async def _cancel_and_wait(task: Optional[asyncio.Task], name: str):
+    """Cancel a background task and swallow its cancellation."""
+    if not task:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.error(f"Error cancelling {name}: {e}")
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up resources when the application shuts down."""
     logger.info("Shutting down API components...")
     try:
-        # Cancel background tasks
-        if hasattr(app.state, 'position_updates_task'):
-            app.state.position_updates_task.cancel()
-            try:
-                await app.state.position_updates_task
-            except asyncio.CancelledError:
-                pass
-            except Exception as e:
-                logger.error(f"Error cancelling position updates task: {e}")
-
-        # Stop sandbox service if it exists
-        sandbox_service = getattr(app.state, 'sandbox_service', None)
-        if sandbox_service:
-            sandbox_service.stop()
-            logger.info("Sandbox service stopped.")
-
-        # Stop data feed manager if it exists
-        data_feed_manager = getattr(app.state, 'data_feed_manager', None)
-        if data_feed_manager:
-            data_feed_manager.stop()
-            logger.info("Data feed manager stopped.")
+        # One state read, then iterate the precomputed lists instead of
+        # probing app.state with hasattr/getattr per component.
+        state = app.state
 
-        # Close all WebSocket connections
-        ws_manager = getattr(app.state, 'ws_manager', None)
+        # Cancel background tasks
+        for task_name in ("position_updates_task", "market_updates_task", "broadcast_drainer_task"):
+            await _cancel_and_wait(getattr(state, task_name, None), task_name)
+
+        # Stop the services that expose a stop()
+        for service_name in ("sandbox_service", "data_feed_manager"):
+            service = getattr(state, service_name, None)
+            if service:
+                service.stop()
+                logger.info(f"{service_name} stopped.")
+
+        # Close all WebSocket connections concurrently: closing one at a
+        # time made shutdown O(connections x rtt), long enough for a deploy
+        # platform to escalate to SIGKILL with many clients attached.
+        ws_manager = getattr(state, 'ws_manager', None)
         if ws_manager:
-            for websocket in ws_manager.active_connections:
-                try:
-                    await websocket.close()
-                except Exception as e:
-                    logger.error(f"Error closing WebSocket connection: {e}")
+            sockets = [ws_client for ws_client, _uid in ws_manager.conns.values()]
+            if sockets:
+                close_tasks = {
+                    asyncio.ensure_future(ws_client.close(code=1001)) for ws_client in sockets
+                }
+                done, pending = await asyncio.wait(close_tasks, timeout=5.0)
+                for pending_task in pending:
+                    pending_task.cancel()
+                close_errors = sum(1 for finished in done if finished.exception() is not None)
+                if close_errors or pending:
+                    logger.warning(
+                        f"WebSocket shutdown: {close_errors} closes failed, {len(pending)} timed out "
+                        f"(of {len(sockets)})."
+                    )
+            # Drop all tracking in one shot; per-socket disconnect bookkeeping
+            # is pointless while the whole server is going away.
+            ws_manager.conns.clear()
+            ws_manager.by_user.clear()
             logger.info("All WebSocket connections closed.")
 
         logger.info("✅ API shutdown complete.")
@@ -879,6 +1297,14 @@ if __name__ == "__main__":
         "backend.api:app", # Ensure this points to the app object correctly
         host=config.API_HOST,
         port=config.API_PORT,
-        log_level=config.LOG_LEVEL.lower(), 
-        reload=config.DEMO_MODE 
+        log_level=config.LOG_LEVEL.lower(),
+        reload=config.DEMO_MODE,
+        # uvloop + httptools: C event loop and HTTP parser; the broadcast and
+        # middleware hot paths are loop-bound, handlers need no changes.
+        loop="uvloop",
+        http="httptools",
+        # Protocol-level pings replace the app-level keepalive frames the WS
+        # endpoint used to send from its receive-timeout branch.
+        ws_ping_interval=config.WS_PING_INTERVAL,
+        ws_ping_timeout=config.WS_PING_TIMEOUT
     )
@@ -46,6 +46,11 @@ EXPIRY_LABELS = {
 # === PRICING ENGINE SETTINGS ===
 RISK_FREE_RATE = 0.05 # 5% annual risk-free rate
 
+# When True, Black-Scholes uses a logistic approximation of the normal CDF
+# (max error ~1e-2) instead of the exact ndtr. Fine for display premiums
+# rounded to 2 decimals; keep False where exact quotes matter.
+FAST_CDF_MODE = False
+
 # Adjusted for more realistic smile effects and broader range for BTC
 MIN_VOLATILITY = 0.15 # 15% minimum annualized volatility floor
 MAX_VOLATILITY = 3.00 # 300% maximum volatility cap
@@ -86,6 +91,7 @@ MAX_SMILE_ADJUSTMENT_FACTOR = 1.50 # Volatility for a strike won't exceed 150% o
 VOLATILITY_GARCH_ENABLED = False # Set to True if GARCH models are integrated
 ML_VOL_TRAINING_INTERVAL = 500 # Example: Retrain ML vol model every 500 data points
 PRICE_CHANGE_THRESHOLD_FOR_BROADCAST = 0.0001 # Threshold for broadcasting price updates
+PRICE_BROADCAST_HEARTBEAT_SECONDS = 5.0 # Send a price frame at least this often so clients know the feed is alive
 
 # === STRIKE GENERATION ===
 # *** UPDATED: Optimized strike ranges for new expiries ***
@@ -149,6 +155,10 @@ CORS_ORIGINS = [
 WS_PING_INTERVAL = 20  # seconds
 WS_PING_TIMEOUT = 20   # seconds
 WS_MAX_MESSAGE_SIZE = 1024 * 1024  # 1MB
+# A broadcast send that cannot complete within this window means the client's
+# transport is backpressured (paused); the client is dropped so the fan-out
+# latency stays independent of the slowest peer.
+WS_SLOW_SEND_TIMEOUT_SECONDS = 2.0
 
 API_STARTUP_TIMEOUT = 20
 WEBSOCKET_TIMEOUT_SECONDS = 30
@@ -156,6 +166,9 @@ WEBSOCKET_TIMEOUT_SECONDS = 30
 # === LOGGING ===
 LOG_LEVEL = "INFO" # Can be "DEBUG" for more verbose output
 LOG_FILE = "logs/atticus.log"
+# When False the slow-request logging middleware is not registered at all,
+# removing its await hop from every request (override: ATTICUS_ENABLE_SLOWLOG).
+ENABLE_SLOWLOG = True
 
 # === DATABASE ===
 DATABASE_URL = "sqlite:///./atticus_demo.db"
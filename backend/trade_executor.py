@@ -25,7 +25,7 @@ class PositionSide(Enum):
     LONG = "long"  # Bought options
     SHORT = "short"  # Sold options
 
-@dataclass
+@dataclass(slots=True)
 class TradeOrder:
     order_id: str
     user_id: str
@@ -42,7 +42,7 @@ class TradeOrder:
     fill_price: Optional[float] = None
     greeks: Dict[str, float] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     position_id: str
     user_id: str
@@ -102,7 +102,7 @@ class Position:
         except Exception as e:
             logger.error(f"❌ Position value update error: {e}")
 
-@dataclass
+@dataclass(slots=True)
 class UserAccount:
     user_id: str
     btc_balance: float
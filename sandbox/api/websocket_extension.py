@@ -1,6 +1,7 @@
 # sandbox/api/websocket_extension.py
 import logging
 import asyncio
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, Tuple, Union
 import time
 
@@ -14,6 +15,22 @@ from backend.data_hub import DataHub
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class SandboxTradeData:
+    """Validated trade parameters handed from the API to the sandbox.
+
+    A slotted dataclass instead of a throwaway dict: fixed-offset attribute
+    reads on the execution path and one small allocation per trade.
+    """
+    user_id: str
+    symbol: str
+    quantity: float
+    side: str
+    strike: float
+    expiry_minutes: int
+    option_type: str
+    current_price: float
+
 class SandboxService:
     """
     The sandbox service now reads data non-invasively from the central DataHub.
@@ -95,7 +112,7 @@ class SandboxService:
             "available_expiries": available_expiries
         }
 
-    async def execute_sandbox_trade(self, trade_data: Dict) -> Tuple[bool, str, Optional[Dict]]:
+    async def execute_sandbox_trade(self, trade_data: SandboxTradeData) -> Tuple[bool, str, Optional[Dict]]:
         """Execute a trade in the sandbox environment and update all necessary components."""
         try:
             # Get current market price
@@ -108,30 +125,30 @@ class SandboxService:
             if self.trade_executor:
                 try:
                     # Create user account if it doesn't exist
-                    if trade_data["user_id"] not in self.trade_executor.user_accounts:
-                        self.trade_executor.create_user_account(trade_data["user_id"])
+                    if trade_data.user_id not in self.trade_executor.user_accounts:
+                        self.trade_executor.create_user_account(trade_data.user_id)
 
                     # Get option chain and matching quote
-                    option_chain = self.pricing_engine.generate_option_chain(trade_data["expiry_minutes"])
+                    option_chain = self.pricing_engine.generate_option_chain(trade_data.expiry_minutes)
                     if not option_chain:
-                        return False, f"No option chain for expiry {trade_data['expiry_minutes']}", None
-                    quotes_list = option_chain.calls if trade_data["option_type"] == "call" else option_chain.puts
-                    matching_quote = next((q for q in quotes_list if abs(q.strike - trade_data["strike"]) < 1e-6), None)
+                        return False, f"No option chain for expiry {trade_data.expiry_minutes}", None
+                    quotes_list = option_chain.calls if trade_data.option_type == "call" else option_chain.puts
+                    matching_quote = next((q for q in quotes_list if abs(q.strike - trade_data.strike) < 1e-6), None)
                     if not matching_quote:
-                        return False, f"Strike {trade_data['strike']} not found in option chain", None
+                        return False, f"Strike {trade_data.strike} not found in option chain", None
 
                     # Construct TradeOrder
                     order = TradeOrder(
-                        order_id=f"sandbox_{int(time.time()*1000)}_{trade_data['user_id'][-4:] if len(trade_data['user_id'])>=4 else trade_data['user_id']}",
-                        user_id=trade_data["user_id"],
+                        order_id=f"sandbox_{int(time.time()*1000)}_{trade_data.user_id[-4:] if len(trade_data.user_id)>=4 else trade_data.user_id}",
+                        user_id=trade_data.user_id,
                         symbol=matching_quote.symbol,
-                        side=OrderSide(trade_data["side"]),
-                        quantity=trade_data["quantity"],
+                        side=OrderSide(trade_data.side),
+                        quantity=trade_data.quantity,
                         premium_per_contract=matching_quote.premium_usd,
-                        total_premium=matching_quote.premium_usd * trade_data["quantity"],
-                        option_type=trade_data["option_type"],
-                        strike=trade_data["strike"],
-                        expiry_minutes=trade_data["expiry_minutes"],
+                        total_premium=matching_quote.premium_usd * trade_data.quantity,
+                        option_type=trade_data.option_type,
+                        strike=trade_data.strike,
+                        expiry_minutes=trade_data.expiry_minutes,
                         timestamp=time.time(),
                         greeks=matching_quote.greeks
                     )
@@ -145,13 +162,13 @@ class SandboxService:
                     # Continue with sandbox execution as fallback
 
             # Map side for synthetic position
-            position_side = 'long' if trade_data["side"] == "buy" else 'short'
+            position_side = 'long' if trade_data.side == "buy" else 'short'
             # Create synthetic position
             position = self.position_manager.add_position(
-                account_id=trade_data["user_id"],
+                account_id=trade_data.user_id,
                 pos_data={
-                    'symbol': trade_data["symbol"],
-                    'size': trade_data["quantity"],
+                    'symbol': trade_data.symbol,
+                    'size': trade_data.quantity,
                     'entry_price': current_price,
                     'side': position_side,
                     'leverage': 1.0,
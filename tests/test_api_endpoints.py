@@ -171,5 +171,25 @@ class TestAPIEndpoints(unittest.TestCase):
         response = self.client.get("/market/option-chains?expiry_minutes=999")
         self.assertEqual(response.status_code, 400)
 
+class TestTradeRequestValidation(unittest.TestCase):
+    def test_uppercase_fields_normalized_to_lowercase(self):
+        """Uppercase option_type/side from clients must validate and normalize."""
+        from backend.api import TradeRequest
+        trade = TradeRequest(user_id="test_user_1", option_type="CALL", strike=50000.0,
+                             expiry_minutes=120, quantity=1.0, side="BUY")
+        self.assertEqual(trade.option_type, "call")
+        self.assertEqual(trade.side, "buy")
+
+    def test_invalid_option_type_still_rejected(self):
+        """Normalization must not loosen the call/put and buy/sell patterns."""
+        from backend.api import TradeRequest
+        from pydantic import ValidationError
+        with self.assertRaises(ValidationError):
+            TradeRequest(user_id="test_user_1", option_type="straddle", strike=50000.0,
+                         expiry_minutes=120, quantity=1.0, side="buy")
+        with self.assertRaises(ValidationError):
+            TradeRequest(user_id="test_user_1", option_type="call", strike=50000.0,
+                         expiry_minutes=120, quantity=1.0, side="hold")
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,79 @@
+import unittest
+from fastapi.testclient import TestClient
+from api import app
+
+
+class TestBlackScholesEndpoints(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test."""
+        self.client = TestClient(app)
+
+        # Fixed inputs so scalar and batch results are directly comparable.
+        self.base_inputs = {
+            "current_price": 50000.0,
+            "time_to_expiry_years": 0.25,
+            "option_type": "call",
+            "risk_free_rate": 0.05,
+            "volatility": 0.80
+        }
+        self.strikes = [48000.0, 50000.0, 52000.0]
+
+    def test_batch_happy_path(self):
+        """Test the batch Black-Scholes endpoint with a valid strike array."""
+        payload = dict(self.base_inputs, strike_prices=self.strikes)
+        response = self.client.post("/blackscholes/batch", json=payload)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+
+        # Check response structure
+        self.assertIn("premiums_usd_per_btc", data)
+        self.assertIn("greeks", data)
+        self.assertIn("inputs_used", data)
+        self.assertEqual(len(data["premiums_usd_per_btc"]), len(self.strikes))
+        for greek_name in ("delta", "gamma", "theta", "vega", "rho"):
+            self.assertIn(greek_name, data["greeks"])
+            self.assertEqual(len(data["greeks"][greek_name]), len(self.strikes))
+
+        # Premiums must be positive and a lower strike call must cost more.
+        premiums = data["premiums_usd_per_btc"]
+        self.assertTrue(all(p > 0 for p in premiums))
+        self.assertGreater(premiums[0], premiums[-1])
+
+        # Explicit inputs are echoed back, not replaced with defaults.
+        self.assertEqual(data["inputs_used"]["risk_free_rate"], 0.05)
+        self.assertEqual(data["inputs_used"]["volatility"], 0.80)
+        self.assertEqual(data["inputs_used"]["option_type"], "call")
+
+    def test_batch_empty_strikes_rejected(self):
+        """Test that an empty strike array is rejected with a 400."""
+        payload = dict(self.base_inputs, strike_prices=[])
+        response = self.client.post("/blackscholes/batch", json=payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"], "strike_prices must not be empty.")
+
+    def test_batch_agrees_with_scalar_endpoint(self):
+        """Test that the batch kernel matches the scalar endpoint per strike."""
+        payload = dict(self.base_inputs, strike_prices=self.strikes)
+        batch_data = self.client.post("/blackscholes/batch", json=payload).json()
+
+        for i, strike in enumerate(self.strikes):
+            scalar_payload = dict(self.base_inputs, strike_price=strike)
+            scalar_response = self.client.post("/blackscholes/calculate", json=scalar_payload)
+            self.assertEqual(scalar_response.status_code, 200)
+            scalar_data = scalar_response.json()
+
+            # The batch path computes in float32, so compare with a relative
+            # tolerance rather than exact equality.
+            scalar_premium = scalar_data["premium_usd_per_btc"]
+            self.assertAlmostEqual(
+                batch_data["premiums_usd_per_btc"][i], scalar_premium,
+                delta=max(1e-4, abs(scalar_premium) * 1e-3))
+            for greek_name in ("delta", "gamma", "theta", "vega", "rho"):
+                scalar_greek = scalar_data["greeks"][greek_name]
+                self.assertAlmostEqual(
+                    batch_data["greeks"][greek_name][i], scalar_greek,
+                    delta=max(1e-4, abs(scalar_greek) * 1e-3))
+
+
+if __name__ == "__main__":
+    unittest.main()
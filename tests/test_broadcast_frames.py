@@ -0,0 +1,59 @@
+import unittest
+from types import SimpleNamespace
+import orjson
+from api import _group_settled_positions
+from backend.api import _coalesce_frames
+
+
+class TestCoalesceFrames(unittest.TestCase):
+    def test_single_frame_passes_through_untouched(self):
+        """A lone frame per target must not be wrapped in a multi frame."""
+        frame = orjson.dumps({"type": "market_update", "data": {"price": 50000.0}})
+        merged = _coalesce_frames([("user_1", frame)])
+        self.assertEqual(merged, [("user_1", frame)])
+
+    def test_same_target_frames_merge_into_multi(self):
+        """Frames sharing a target merge into one valid multi frame, in order."""
+        first = orjson.dumps({"type": "trade_executed", "data": {"trade_id": "t1"}})
+        second = orjson.dumps({"type": "position_update", "data": {"positions": []}})
+        merged = _coalesce_frames([("user_1", first), ("user_1", second)])
+
+        self.assertEqual(len(merged), 1)
+        target, payload = merged[0]
+        self.assertEqual(target, "user_1")
+
+        # The spliced bytes must still parse as JSON and keep frame order.
+        decoded = orjson.loads(payload)
+        self.assertEqual(decoded["type"], "multi")
+        self.assertEqual(decoded["items"], [orjson.loads(first), orjson.loads(second)])
+
+    def test_distinct_targets_stay_separate(self):
+        """Frames for different targets (including broadcast) never merge."""
+        user_frame = orjson.dumps({"type": "trade_executed", "data": {}})
+        all_frame = orjson.dumps({"type": "market_update", "data": {}})
+        merged = _coalesce_frames([("user_1", user_frame), (None, all_frame)])
+        self.assertEqual(merged, [("user_1", user_frame), (None, all_frame)])
+
+
+class TestGroupSettledPositions(unittest.TestCase):
+    def test_one_frame_payload_per_user(self):
+        """Settlements batch into one data list per user, preserving order."""
+        settled = [
+            SimpleNamespace(user_id="user_1", position_id="p1", unrealized_pnl=10.0),
+            SimpleNamespace(user_id="user_2", position_id="p2", unrealized_pnl=-5.0),
+            SimpleNamespace(user_id="user_1", position_id="p3", unrealized_pnl=2.5),
+        ]
+        grouped = _group_settled_positions(settled)
+        self.assertEqual(set(grouped), {"user_1", "user_2"})
+        self.assertEqual(grouped["user_1"], [
+            {"position_id": "p1", "final_pnl": 10.0},
+            {"position_id": "p3", "final_pnl": 2.5},
+        ])
+        self.assertEqual(grouped["user_2"], [{"position_id": "p2", "final_pnl": -5.0}])
+
+    def test_empty_settlement_list(self):
+        self.assertEqual(_group_settled_positions([]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()